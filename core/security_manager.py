@@ -17,6 +17,23 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Arquivos verificados por audit_project_security (e que invalidam o cache
+# da auditoria em scripts/security_audit.py)
+AUDIT_EXTENSIONS = ('.py', '.yaml', '.yml', '.json', '.txt', '.md')
+AUDIT_SKIP_DIRS = frozenset({'.git', '__pycache__', 'venv', 'env', 'node_modules', '.setup_cache'})
+# Relatórios gerados pela própria auditoria
+AUDIT_SKIP_PREFIXES = ('security_report_',)
+
+def iter_audit_files(project_path: str = "."):
+    """Caminhos dos arquivos do projeto que a auditoria verifica"""
+    for root, dirs, files in os.walk(project_path):
+        # Pular diretórios que não devem ser verificados
+        dirs[:] = [d for d in dirs if d not in AUDIT_SKIP_DIRS]
+        
+        for file in files:
+            if file.endswith(AUDIT_EXTENSIONS) and not file.startswith(AUDIT_SKIP_PREFIXES):
+                yield os.path.join(root, file)
+
 class SecurityManager:
     """
     Gerenciador de segurança opcional para o sistema.
@@ -297,28 +314,19 @@ class SecurityManager:
             "timestamp": datetime.now().isoformat()
         }
         
-        # Extensões de arquivo para verificar
-        extensions = ['.py', '.yaml', '.yml', '.json', '.txt', '.md']
-        
         try:
-            for root, dirs, files in os.walk(project_path):
-                # Pular diretórios que não devem ser verificados
-                dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__', 'venv', 'env', 'node_modules']]
+            for file_path in iter_audit_files(project_path):
+                file_result = self.check_file_security(file_path)
                 
-                for file in files:
-                    if any(file.endswith(ext) for ext in extensions):
-                        file_path = os.path.join(root, file)
-                        file_result = self.check_file_security(file_path)
-                        
-                        result["files_checked"] += 1
-                        
-                        if not file_result["secure"]:
-                            result["secure"] = False
-                            result["issues"].append({
-                                "file": file_path,
-                                "issues": file_result["issues"]
-                            })
-                            
+                result["files_checked"] += 1
+                
+                if not file_result["secure"]:
+                    result["secure"] = False
+                    result["issues"].append({
+                        "file": file_path,
+                        "issues": file_result["issues"]
+                    })
+                    
         except Exception as e:
             result["issues"].append(f"Erro na auditoria: {e}")
             result["secure"] = False
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Funções compartilhadas pelos scripts de setup e de auditoria
+"""
+
+import io
+import os
+import sys
+import json
+import contextlib
+import functools
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def write_json_report(report_file, report):
+    """Salva o relatório em JSON (orjson quando disponível, json como fallback)"""
+    if orjson is not None:
+        Path(report_file).write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    else:
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+def list_dir_names(directory="."):
+    """Lista os nomes de um diretório com um único scandir (vazio se não existir)"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+def buffered(func):
+    """Acumula os prints da verificação e os escreve no stdout de uma só vez"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buffer):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+    return wrapper
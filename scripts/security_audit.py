@@ -10,25 +10,83 @@ Pode ser executado independentemente sem afetar o funcionamento.
 
 import os
 import sys
+import re
 import json
+import hashlib
 import argparse
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 
+from _common import buffered, write_json_report, list_dir_names
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Resultado da última auditoria completa, invalidado quando algum arquivo muda
+AUDIT_CACHE_FILE = Path(".setup_cache") / "audit.json"
+
+# Chaves procuradas no config.yaml e o problema reportado para cada uma
+HARDCODED_SECRET_KEYS = [
+    ('api_key', "Possível chave de API hardcoded"),
+    ('api_secret', "Possível secret de API hardcoded"),
+    ('password', "Possível senha hardcoded"),
+]
+
+# Cada agulha mapeia para (chave, valor_vazio); 'key: ""' indica campo vazio
+_SECRET_NEEDLES = {}
+for _key, _ in HARDCODED_SECRET_KEYS:
+    _SECRET_NEEDLES[f'{_key}: ""'] = (_key, True)
+    _SECRET_NEEDLES[f'{_key}: "'] = (_key, False)
+
 # Adicionar o diretório raiz ao path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from core.security_manager import SecurityManager, enable_security, disable_security
+@lru_cache(maxsize=1)
+def get_audit_manager():
+    """Retorna o SecurityManager ativo compartilhado pela auditoria"""
+    # Import tardio: o modo --quick não precisa carregar o core
+    from core.security_manager import SecurityManager
+    
+    return SecurityManager(enabled=True)
+
+def _build_secret_matcher():
+    """Compila as agulhas em um único autômato (ou regex como fallback)"""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for needle, value in _SECRET_NEEDLES.items():
+            automaton.add_word(needle, value)
+        automaton.make_automaton()
+        return lambda content: (value for _, value in automaton.iter(content))
+    
+    # Agulhas mais longas primeiro para que 'key: ""' vença 'key: "'
+    regex = re.compile('|'.join(re.escape(n) for n in sorted(_SECRET_NEEDLES, key=len, reverse=True)))
+    return lambda content: (_SECRET_NEEDLES[m.group()] for m in regex.finditer(content))
+
+_find_secret_needles = _build_secret_matcher()
+
+def find_hardcoded_secrets(content):
+    """Varre o conteúdo uma única vez e retorna os problemas encontrados"""
+    found, empty = set(), set()
+    for key, is_empty in _find_secret_needles(content):
+        found.add(key)
+        if is_empty:
+            empty.add(key)
+    
+    return [issue for key, issue in HARDCODED_SECRET_KEYS if key in found and key not in empty]
 
-def print_header():
+def print_header(now):
     """Imprime cabeçalho do script"""
     print("=" * 80)
     print("🔒 AUDITORIA DE SEGURANÇA - SISTEMA DE ANÁLISE FINANCEIRA")
     print("=" * 80)
-    print(f"Data/Hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+    print(f"Data/Hora: {now.strftime('%d/%m/%Y %H:%M:%S')}")
     print(f"Versão: 1.0")
     print("=" * 80)
 
+@buffered
 def check_dependencies():
     """Verifica dependências de segurança"""
     print("\n📦 VERIFICANDO DEPENDÊNCIAS DE SEGURANÇA")
@@ -59,20 +117,22 @@ def check_dependencies():
     
     return len(missing_deps) == 0
 
+@buffered
 def check_env_file():
     """Verifica arquivo .env"""
     print("\n🔐 VERIFICANDO ARQUIVO .ENV")
     print("-" * 50)
     
-    env_file = Path(".env")
-    env_template = Path(".env.template")
+    # Um único scandir responde por .env, .env.template e .gitignore
+    present = list_dir_names(".")
+    env_exists = ".env" in present
     
-    if env_file.exists():
+    if env_exists:
         print("✅ Arquivo .env encontrado")
         
         # Verificar se está no .gitignore
         gitignore = Path(".gitignore")
-        if gitignore.exists():
+        if ".gitignore" in present:
             with open(gitignore, 'r', encoding='utf-8') as f:
                 content = f.read()
                 if '.env' in content:
@@ -83,13 +143,14 @@ def check_env_file():
             print("❌ Arquivo .gitignore não encontrado")
     else:
         print("⚠️  Arquivo .env não encontrado")
-        if env_template.exists():
+        if ".env.template" in present:
             print("💡 Copie .env.template para .env e configure suas chaves")
         else:
             print("❌ Template .env.template não encontrado")
     
-    return env_file.exists()
+    return env_exists
 
+@buffered
 def check_config_security():
     """Verifica segurança do arquivo de configuração"""
     print("\n⚙️  VERIFICANDO CONFIGURAÇÃO")
@@ -97,7 +158,7 @@ def check_config_security():
     
     config_file = Path("config/config.yaml")
     
-    if not config_file.exists():
+    if "config.yaml" not in list_dir_names("config"):
         print("❌ Arquivo config.yaml não encontrado")
         return False
     
@@ -106,16 +167,7 @@ def check_config_security():
             content = f.read()
         
         # Verificar por chaves hardcoded
-        issues = []
-        
-        if 'api_key: "' in content and 'api_key: ""' not in content:
-            issues.append("Possível chave de API hardcoded")
-        
-        if 'api_secret: "' in content and 'api_secret: ""' not in content:
-            issues.append("Possível secret de API hardcoded")
-        
-        if 'password: "' in content and 'password: ""' not in content:
-            issues.append("Possível senha hardcoded")
+        issues = find_hardcoded_secrets(content)
         
         if issues:
             print("❌ Problemas encontrados:")
@@ -130,17 +182,58 @@ def check_config_security():
         print(f"❌ Erro ao verificar configuração: {e}")
         return False
 
+def project_signature(project_path="."):
+    """Retorna o hash de (caminho, mtime, tamanho) dos arquivos que a auditoria verifica
+    
+    O conjunto de arquivos é o mesmo de SecurityManager.audit_project_security,
+    que já ignora os relatórios gerados por este script e o .setup_cache.
+    """
+    from core.security_manager import iter_audit_files
+    
+    digest = hashlib.sha1()
+    for file_path in sorted(iter_audit_files(project_path)):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        digest.update(f"{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+def load_cached_audit(signature):
+    """Retorna a auditoria salva se a assinatura do projeto não mudou"""
+    try:
+        cached = json.loads(AUDIT_CACHE_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    
+    if cached.get('signature') != signature:
+        return None
+    return cached.get('result')
+
+def save_cached_audit(signature, audit_result):
+    """Persiste a auditoria junto com a assinatura do projeto"""
+    try:
+        AUDIT_CACHE_FILE.parent.mkdir(exist_ok=True)
+        write_json_report(AUDIT_CACHE_FILE, {'signature': signature, 'result': audit_result})
+    except OSError as e:
+        print(f"⚠️  Não foi possível salvar o cache da auditoria: {e}")
+
+@buffered
 def run_security_audit():
     """Executa auditoria completa de segurança"""
     print("\n🔍 EXECUTANDO AUDITORIA DE SEGURANÇA")
     print("-" * 50)
     
-    # Ativar gerenciador de segurança
-    enable_security()
-    security_manager = SecurityManager(enabled=True)
+    # Reaproveitar a última auditoria se nenhum arquivo verificado mudou
+    signature = project_signature()
+    audit_result = load_cached_audit(signature)
     
-    # Executar auditoria
-    audit_result = security_manager.audit_project_security()
+    if audit_result is None:
+        # Executar auditoria com o gerenciador compartilhado do processo
+        audit_result = get_audit_manager().audit_project_security()
+        save_cached_audit(signature, audit_result)
+    else:
+        print("♻️  Nenhum arquivo alterado - reutilizando a última auditoria")
     
     print(f"📁 Arquivos verificados: {audit_result['files_checked']}")
     
@@ -153,23 +246,29 @@ def run_security_audit():
             for problem in issue['issues']:
                 print(f"      - {problem}")
     
-    # Desativar gerenciador
-    disable_security()
-    
     return audit_result['secure']
 
+@buffered
 def check_git_history():
     """Verifica histórico do Git por informações sensíveis"""
     print("\n📜 VERIFICANDO HISTÓRICO DO GIT")
     print("-" * 50)
     
     try:
+        import shutil
         import subprocess
         
-        # Verificar se é um repositório Git
-        result = subprocess.run(['git', 'status'], capture_output=True, text=True)
+        if shutil.which('git') is None:
+            print("⚠️  Git não encontrado no PATH")
+            return True
+        
+        # Verificar se é um repositório Git (rev-parse não percorre o índice como o status)
+        result = subprocess.run(
+            ['git', 'rev-parse', '--is-inside-work-tree'],
+            capture_output=True, text=True
+        )
         
-        if result.returncode != 0:
+        if result.returncode != 0 or result.stdout.strip() != 'true':
             print("⚠️  Não é um repositório Git")
             return True
         
@@ -194,13 +293,17 @@ def check_git_history():
         print(f"⚠️  Erro ao verificar Git: {e}")
         return True
 
-def generate_security_report():
-    """Gera relatório de segurança"""
+def generate_security_report(now):
+    """Gera relatório de segurança
+    
+    Args:
+        now: Instante da execução, compartilhado pelo conteúdo e pelo nome do arquivo
+    """
     print("\n📋 GERANDO RELATÓRIO DE SEGURANÇA")
     print("-" * 50)
     
     report = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "checks": {}
     }
     
@@ -221,11 +324,10 @@ def generate_security_report():
     report["passed_checks"] = passed_checks
     
     # Salvar relatório
-    report_file = f"security_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    report_file = f"security_report_{now.strftime('%Y%m%d_%H%M%S')}.json"
     
     try:
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        write_json_report(report_file, report)
         
         print(f"✅ Relatório salvo em: {report_file}")
         
@@ -255,8 +357,9 @@ def main():
     parser.add_argument("--fix", action="store_true", help="Tentar corrigir problemas")
     
     args = parser.parse_args()
+    now = datetime.now()
     
-    print_header()
+    print_header(now)
     
     if args.quick:
         print("\n⚡ EXECUÇÃO RÁPIDA")
@@ -264,14 +367,16 @@ def main():
         check_env_file()
         check_config_security()
     elif args.report:
-        generate_security_report()
+        generate_security_report(now)
     elif args.fix:
+        # Correções invalidam o resultado em cache da auditoria
+        AUDIT_CACHE_FILE.unlink(missing_ok=True)
         print("\n🔧 MODO CORREÇÃO")
         print("⚠️  Este modo ainda não está implementado")
         print("💡 Use --report para ver os problemas")
     else:
         # Execução completa
-        generate_security_report()
+        generate_security_report(now)
     
     print("\n" + "=" * 80)
     print("🔒 AUDITORIA CONCLUÍDA")
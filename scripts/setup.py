@@ -9,11 +9,22 @@ do sistema de análise financeira.
 
 import os
 import sys
+import shlex
 import subprocess
-import json
+import threading
+import hashlib
 from pathlib import Path
 from datetime import datetime
 
+from _common import buffered, write_json_report, list_dir_names
+
+# Sentinela com o hash do requirements.txt da última instalação bem-sucedida
+SETUP_CACHE_DIR = Path(".setup_cache")
+REQUIREMENTS_HASH_FILE = SETUP_CACHE_DIR / "req.sha"
+
+# Apenas o final do stderr é exibido em caso de falha
+STDERR_TAIL_BYTES = 4096
+
 def print_header(title):
     """Imprime cabeçalho formatado"""
     print("\n" + "="*60)
@@ -24,31 +35,59 @@ def print_step(step, description):
     """Imprime passo do setup"""
     print(f"\n📋 {step}. {description}")
 
-def run_command(command, description, check=True):
-    """Executa comando e retorna sucesso"""
+def _drain_tail(stream, tail):
+    """Consome o stream mantendo apenas os últimos STDERR_TAIL_BYTES bytes"""
+    for chunk in iter(lambda: stream.read(1024), b""):
+        tail += chunk
+        del tail[:-STDERR_TAIL_BYTES]
+
+def run_command(command, description, check=True, stream_output=False):
+    """Executa comando e retorna sucesso
+    
+    O comando é executado sem shell. Com stream_output=True a saída vai
+    direto para o terminal; caso contrário o stdout é descartado e só o
+    final do stderr é guardado para a mensagem de erro.
+    """
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=300
+        args = shlex.split(command) if isinstance(command, str) else list(command)
+        process = subprocess.Popen(
+            args,
+            stdout=None if stream_output else subprocess.DEVNULL,
+            stderr=None if stream_output else subprocess.PIPE
         )
         
-        if result.returncode == 0:
+        tail = bytearray()
+        reader = None
+        if process.stderr is not None:
+            reader = threading.Thread(target=_drain_tail, args=(process.stderr, tail), daemon=True)
+            reader.start()
+        
+        try:
+            returncode = process.wait(timeout=300)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            if reader is not None:
+                reader.join()
+        
+        if returncode == 0:
             print(f"✅ {description} - Sucesso")
             return True
         else:
             print(f"❌ {description} - Falha")
-            if result.stderr:
-                print(f"   Erro: {result.stderr[:200]}...")
+            if tail:
+                stderr = tail.decode("utf-8", errors="replace")
+                print(f"   Erro: {stderr[-200:]}...")
             return False
             
     except Exception as e:
         print(f"❌ {description} - Erro: {e}")
         return False
 
+@buffered
 def check_python_version():
     """Verifica versão do Python"""
     print_step(1, "Verificando versão do Python")
@@ -61,6 +100,7 @@ def check_python_version():
         print(f"❌ Python {version.major}.{version.minor}.{version.micro} - Versão mínima: 3.8")
         return False
 
+@buffered
 def create_directories():
     """Cria diretórios necessários"""
     print_step(2, "Criando estrutura de diretórios")
@@ -74,29 +114,56 @@ def create_directories():
         "config"
     ]
     
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
-        print(f"✅ Diretório criado: {directory}")
+    # Pais primeiro; prefixos já criados não são verificados de novo
+    created = set()
+    failed = []
+    for directory in sorted(directories, key=lambda d: d.count("/")):
+        try:
+            parent = os.path.dirname(directory)
+            if parent and parent not in created:
+                os.makedirs(parent, exist_ok=True)
+                created.add(parent)
+            os.makedirs(directory, exist_ok=True)
+            created.add(directory)
+        except OSError as e:
+            failed.append(f"{directory} ({e})")
     
-    return True
+    if failed:
+        print(f"❌ Erro ao criar: {', '.join(failed)}")
+    print(f"✅ {len(directories) - len(failed)}/{len(directories)} diretórios prontos")
+    
+    return not failed
 
 def install_dependencies():
     """Instala dependências do projeto"""
     print_step(3, "Instalando dependências")
     
     # Verificar se requirements.txt existe
-    if not Path("requirements.txt").exists():
+    if "requirements.txt" not in list_dir_names("."):
         print("❌ Arquivo requirements.txt não encontrado")
         return False
     
+    # Pular o pip quando o requirements.txt não mudou desde a última instalação
+    requirements_hash = hashlib.sha256(Path("requirements.txt").read_bytes()).hexdigest()
+    if (REQUIREMENTS_HASH_FILE.exists()
+            and REQUIREMENTS_HASH_FILE.read_text().strip() == requirements_hash):
+        print("✅ requirements.txt inalterado - instalação ignorada")
+        return True
+    
     # Instalar dependências
     success = run_command(
-        "pip install -r requirements.txt",
-        "Instalando dependências do requirements.txt"
+        "pip install -r requirements.txt --disable-pip-version-check --no-input -q",
+        "Instalando dependências do requirements.txt",
+        stream_output=True
     )
     
+    if success:
+        SETUP_CACHE_DIR.mkdir(exist_ok=True)
+        REQUIREMENTS_HASH_FILE.write_text(requirements_hash)
+    
     return success
 
+@buffered
 def validate_imports():
     """Valida imports principais"""
     print_step(4, "Validando imports principais")
@@ -126,6 +193,7 @@ def validate_imports():
     
     return True
 
+@buffered
 def test_core_functionality():
     """Testa funcionalidade básica do core"""
     print_step(5, "Testando funcionalidade do core")
@@ -148,18 +216,8 @@ def test_core_functionality():
         print(f"❌ Erro no core: {e}")
         return False
 
-def create_config_files():
-    """Cria arquivos de configuração"""
-    print_step(6, "Criando arquivos de configuração")
-    
-    # Verificar se config.yaml já existe
-    if Path("config/config.yaml").exists():
-        print("✅ config.yaml já existe")
-    else:
-        print("⚠️ config.yaml não encontrado - será criado pelo usuário")
-    
-    # Criar .env template com configurações de segurança
-    env_template = """# 🔒 CONFIGURAÇÕES DE AMBIENTE - SISTEMA DE ANÁLISE FINANCEIRA
+# Template do .env, codificado uma única vez na carga do módulo
+ENV_TEMPLATE = """# 🔒 CONFIGURAÇÕES DE AMBIENTE - SISTEMA DE ANÁLISE FINANCEIRA
 # ⚠️ IMPORTANTE: Copie este arquivo para .env e configure suas chaves
 # ⚠️ NUNCA commite o arquivo .env no repositório
 
@@ -382,20 +440,38 @@ TIMEZONE=America/Sao_Paulo
 # 3. Mantenha as chaves de API seguras
 # 4. Nunca commite o arquivo .env
 # 5. Use diferentes configurações para cada ambiente
-"""
+""".encode("utf-8")
+
+@buffered
+def create_config_files():
+    """Cria arquivos de configuração"""
+    print_step(6, "Criando arquivos de configuração")
     
-    with open(".env.template", "w", encoding="utf-8") as f:
-        f.write(env_template)
+    # Verificar se config.yaml já existe
+    if "config.yaml" in list_dir_names("config"):
+        print("✅ config.yaml já existe")
+    else:
+        print("⚠️ config.yaml não encontrado - será criado pelo usuário")
+    
+    # Criar .env template com configurações de segurança (só reescreve se o conteúdo mudou)
+    template_path = Path(".env.template")
+    try:
+        current = template_path.read_bytes()
+    except FileNotFoundError:
+        current = None
+    if current != ENV_TEMPLATE:
+        template_path.write_bytes(ENV_TEMPLATE)
     
     print("✅ .env.template criado com configurações de segurança")
     return True
 
+@buffered
 def run_quick_tests():
     """Executa testes rápidos"""
     print_step(7, "Executando testes rápidos")
     
     # Teste do script de testes
-    if Path("scripts/run_tests.py").exists():
+    if "run_tests.py" in list_dir_names("scripts"):
         success = run_command(
             "python scripts/run_tests.py",
             "Executando testes automatizados",
@@ -406,8 +482,13 @@ def run_quick_tests():
         print("⚠️ Script de testes não encontrado")
         return True
 
-def generate_setup_report(results):
-    """Gera relatório do setup"""
+def generate_setup_report(results, now):
+    """Gera relatório do setup
+    
+    Args:
+        results: Resultado de cada passo do setup
+        now: Instante da execução, compartilhado pelo conteúdo e pelo nome do arquivo
+    """
     print_header("RELATÓRIO DO SETUP")
     
     total_steps = len(results)
@@ -425,16 +506,15 @@ def generate_setup_report(results):
     
     # Salvar relatório
     report = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now.isoformat(),
         'total_steps': total_steps,
         'successful_steps': successful_steps,
         'success_rate': success_rate,
         'results': results
     }
     
-    report_file = f"setup_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(report_file, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+    report_file = f"setup_report_{now.strftime('%Y%m%d_%H%M%S')}.json"
+    write_json_report(report_file, report)
     
     print(f"\n📄 Relatório salvo em: {report_file}")
     
@@ -473,8 +553,10 @@ def print_next_steps():
 
 def main():
     """Função principal"""
+    now = datetime.now()
+    
     print_header("SETUP DO SISTEMA DE ANÁLISE FINANCEIRA")
-    print(f"Data/Hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+    print(f"Data/Hora: {now.strftime('%d/%m/%Y %H:%M:%S')}")
     print(f"Diretório: {os.getcwd()}")
     
     # Executar todos os passos
@@ -489,7 +571,7 @@ def main():
     }
     
     # Gerar relatório
-    success = generate_setup_report(results)
+    success = generate_setup_report(results, now)
     
     if success:
         print("\n🎉 SETUP CONCLUÍDO COM SUCESSO!")
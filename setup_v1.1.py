@@ -7,11 +7,20 @@ do Sistema de Análise de Portfólios.
 
 Uso:
     python setup_v1.1.py
+    python setup_v1.1.py --yes --no-dev        # sem perguntas, sem ferramentas de dev
+    python setup_v1.1.py --non-interactive     # CI: respostas padrão para tudo
 """
 
+import argparse
+import io
 import os
 import sys
+import functools
+import hashlib
+import importlib.util
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 import shutil
 
@@ -28,33 +37,140 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# Ferramentas de desenvolvimento instaladas opcionalmente junto com as dependências
+DEV_TOOLS = [
+    "pytest",
+    "pytest-cov",
+    "pytest-mock",
+    "black",
+    "flake8",
+    "mypy",
+    "isort",
+    "pre-commit",
+    "bandit",
+]
+
+
+# Estado já verificado por etapas anteriores do setup, evitando novas sondagens
+_SETUP_CACHE = {}
+
+# Estado persistido entre execuções do setup; o freeze serve de constraints
+# e, para o mesmo requirements.txt, de lock instalado sem resolver dependências
+SETUP_STATE_DIR = Path(".cache") / "setup"
+CONSTRAINTS_FILE = SETUP_STATE_DIR / "constraints.txt"
+REQUIREMENTS_STAMP = SETUP_STATE_DIR / "reqs.hash"
+
+
+# Barra dos cabeçalhos, montada uma única vez
+_BAR = f"{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}"
+
+
+@functools.lru_cache(maxsize=32)
+def _format_header(message):
+    """Monta o bloco de três linhas do cabeçalho"""
+    return f"\n{_BAR}\n{Colors.HEADER}{Colors.BOLD}{message.center(60)}{Colors.ENDC}\n{_BAR}\n\n"
+
+
 def print_header(message):
     """Imprime cabeçalho colorido"""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{message.center(60)}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}\n")
+    sys.stdout.write(_format_header(message))
+
+
+# Prefixos coloridos montados uma vez; cada mensagem vira um único write
+_PREFIXES = {
+    "ok": f"{Colors.OKGREEN}✓ ",
+    "err": f"{Colors.FAIL}✗ ",
+    "warn": f"{Colors.WARNING}⚠ ",
+    "info": f"{Colors.OKBLUE}ℹ ",
+}
+_SUFFIX = Colors.ENDC + "\n"
 
 
 def print_success(message):
     """Imprime mensagem de sucesso"""
-    print(f"{Colors.OKGREEN}✓ {message}{Colors.ENDC}")
+    sys.stdout.write(_PREFIXES["ok"] + message + _SUFFIX)
 
 
 def print_error(message):
     """Imprime mensagem de erro"""
-    print(f"{Colors.FAIL}✗ {message}{Colors.ENDC}")
+    sys.stdout.write(_PREFIXES["err"] + message + _SUFFIX)
 
 
 def print_warning(message):
     """Imprime mensagem de aviso"""
-    print(f"{Colors.WARNING}⚠ {message}{Colors.ENDC}")
+    sys.stdout.write(_PREFIXES["warn"] + message + _SUFFIX)
 
 
 def print_info(message):
     """Imprime mensagem informativa"""
-    print(f"{Colors.OKBLUE}ℹ {message}{Colors.ENDC}")
+    sys.stdout.write(_PREFIXES["info"] + message + _SUFFIX)
+
+
+def enable_buffered_stdout():
+    """Troca o stdout por um wrapper bufferizado, descarregado a cada etapa
+    
+    Subprocessos escrevem direto no terminal, então sys.stdout.flush() deve
+    ser chamado antes de iniciá-los para preservar a ordem da saída.
+    """
+    if not hasattr(sys.stdout, "buffer"):
+        return
+    sys.stdout.flush()
+    sys.stdout = io.TextIOWrapper(
+        sys.stdout.buffer,
+        encoding=sys.stdout.encoding,
+        errors=sys.stdout.errors,
+        write_through=False,
+    )
+
+
+def run_streaming(command):
+    """Executa o comando repassando sua saída linha a linha
+    
+    A saída é drenada por uma thread enquanto o chamador apenas aguarda o
+    processo, sem bloquear as demais etapas do setup.
+    
+    Raises:
+        subprocess.CalledProcessError: Se o comando terminar com erro
+    """
+    sys.stdout.flush()
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1,
+        text=True,
+    )
+    
+    def drain():
+        for line in process.stdout:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+    
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    
+    returncode = process.wait()
+    reader.join()
+    process.stdout.close()
+    
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+
+
+@functools.lru_cache(maxsize=1)
+def find_uv():
+    """Caminho do uv (instalador compatível com pip, bem mais rápido), se houver"""
+    return shutil.which("uv")
+
+
+def pip_command(subcommand):
+    """Monta o comando pip para o interpretador atual, via uv quando disponível"""
+    if find_uv():
+        return [find_uv(), "pip", subcommand, "--python", sys.executable]
+    return [sys.executable, "-m", "pip", subcommand]
 
 
+@functools.lru_cache(maxsize=None)
 def check_python_version():
     """Verifica se a versão do Python é adequada"""
     print_header("Verificando Versão do Python")
@@ -72,8 +188,12 @@ def check_python_version():
         return False
 
 
-def create_env_file():
-    """Cria arquivo .env a partir do template"""
+def create_env_file(overwrite=None):
+    """Cria arquivo .env a partir do template
+    
+    Args:
+        overwrite: Se o .env existente deve ser sobrescrito; None pergunta ao usuário
+    """
     print_header("Configurando Variáveis de Ambiente")
     
     env_file = Path(".env")
@@ -81,8 +201,9 @@ def create_env_file():
     
     if env_file.exists():
         print_warning(".env já existe")
-        response = input("Deseja sobrescrever? (s/N): ").strip().lower()
-        if response != 's':
+        if overwrite is None:
+            overwrite = input("Deseja sobrescrever? (s/N): ").strip().lower() == 's'
+        if not overwrite:
             print_info("Mantendo .env existente")
             return True
     
@@ -91,7 +212,10 @@ def create_env_file():
         return False
     
     try:
-        shutil.copy(template_file, env_file)
+        # copyfile copia só o conteúdo (sendfile no Linux), sem o stat/chmod do
+        # shutil.copy. Hardlink não serve: editar o .env alteraria o template
+        # versionado junto com as credenciais.
+        shutil.copyfile(template_file, env_file)
         print_success(f"Arquivo .env criado a partir de {template_file}")
         print_info("IMPORTANTE: Edite o arquivo .env com suas credenciais!")
         return True
@@ -117,22 +241,44 @@ def create_directories():
         "tests/fixtures",
     ]
     
+    ready = _SETUP_CACHE.setdefault('dirs', set())
+    failed = []
+    
+    # mkdir direto: um único syscall em vez de exists() + mkdir()
     for directory in directories:
-        path = Path(directory)
-        if not path.exists():
-            try:
-                path.mkdir(parents=True, exist_ok=True)
-                print_success(f"Criado: {directory}")
-            except Exception as e:
-                print_error(f"Erro ao criar {directory}: {e}")
-        else:
-            print_info(f"Já existe: {directory}")
+        if directory in ready:
+            continue
+        try:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            failed.append(f"{directory} ({e})")
+            continue
+        ready.add(directory)
+    
+    if failed:
+        print_error(f"Erro ao criar: {', '.join(failed)}")
+    print_success(f"{len(directories) - len(failed)}/{len(directories)} diretórios prontos")
     
     return True
 
 
-def install_dependencies():
-    """Instala dependências do requirements.txt"""
+def install_dependencies(include_dev_tools=False):
+    """Instala dependências do requirements.txt
+    
+    pip, setuptools, wheel, o requirements.txt e (opcionalmente) as
+    ferramentas de desenvolvimento são resolvidos em uma única execução
+    do pip, pagando uma só vez a inicialização do interpretador e do resolver.
+    
+    Wheels prontas são tentadas primeiro e, após uma instalação bem-sucedida,
+    as versões resolvidas viram constraints (CONSTRAINTS_FILE) das próximas.
+    
+    Para reaproveitar wheels compiladas entre execuções (CI, novos venvs),
+    aponte PIP_CACHE_DIR para um diretório persistente. Se o uv estiver no
+    PATH ele substitui o pip nas instalações.
+    
+    Args:
+        include_dev_tools: Se True, instala também DEV_TOOLS
+    """
     print_header("Instalando Dependências")
     
     requirements_file = Path("requirements.txt")
@@ -141,80 +287,143 @@ def install_dependencies():
         print_error("requirements.txt não encontrado")
         return False
     
+    # Pular tudo se requirements.txt e ambiente são os da última instalação
+    fingerprint = requirements_fingerprint(requirements_file, include_dev_tools)
+    stamp = read_requirements_stamp()
+    if stamp == (fingerprint, sys.prefix):
+        print_info("requirements.txt inalterado, pulando instalação")
+        if include_dev_tools:
+            _SETUP_CACHE['pytest_ok'] = True
+        return True
+    
     print_info("Instalando pacotes... (isso pode demorar)")
     
+    pip_install = pip_command("install")
+    # O uv já prioriza wheels e não aceita --prefer-binary
+    prefer_binary = [] if find_uv() else ["--prefer-binary"]
+    command = pip_install + [
+        "--upgrade", "pip", "setuptools", "wheel",
+        "-r", "requirements.txt",
+    ]
+    
+    if include_dev_tools:
+        print_info(f"Incluindo ferramentas de dev: {', '.join(DEV_TOOLS)}")
+        command += DEV_TOOLS
+    
     try:
-        # Atualizar pip
-        print_info("Atualizando pip...")
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", "--upgrade", "pip"
-        ], stdout=subprocess.DEVNULL)
-        
-        # Instalar dependências
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", "-r", "requirements.txt"
-        ])
-        
-        print_success("Dependências instaladas com sucesso")
-        return True
-        
+        # Sem o wheel o pip não guarda no cache as wheels que compila a partir
+        # de sdists; instalá-lo antes do requirements.txt habilita esse cache
+        if not find_uv() and importlib.util.find_spec("wheel") is None:
+            print_info("Instalando wheel e setuptools...")
+            sys.stdout.flush()
+            subprocess.check_call([
+                sys.executable, "-m", "pip", "install", "--upgrade", "pip", "wheel", "setuptools"
+            ], stdout=subprocess.DEVNULL)
     except subprocess.CalledProcessError as e:
         print_error(f"Erro ao instalar dependências: {e}")
         return False
-
-
-def install_dev_tools():
-    """Instala ferramentas de desenvolvimento (opcional)"""
-    print_header("Ferramentas de Desenvolvimento (Opcional)")
     
-    response = input("Instalar ferramentas de desenvolvimento? (S/n): ").strip().lower()
+    # Versões da última instalação bem-sucedida poupam a busca do resolver
+    constraints = ["-c", str(CONSTRAINTS_FILE)] if CONSTRAINTS_FILE.exists() else []
     
-    if response == 'n':
-        print_info("Pulando ferramentas de desenvolvimento")
-        return True
+    attempts = []
     
-    dev_tools = [
-        "pytest",
-        "pytest-cov",
-        "pytest-mock",
-        "black",
-        "flake8",
-        "mypy",
-        "isort",
-        "pre-commit",
-        "bandit",
+    # Mesmo requirements.txt em outro ambiente: o freeze da última instalação
+    # já é a resolução completa, então instala direto dele sem o resolver.
+    # (pip freeze não traz hashes, por isso não há --require-hashes)
+    if stamp is not None and stamp[0] == fingerprint and CONSTRAINTS_FILE.exists():
+        attempts.append(pip_install + prefer_binary + ["--no-deps", "-r", str(CONSTRAINTS_FILE)])
+    
+    # Primeiro só wheels prontas; compilar sdists fica como último recurso
+    attempts += [
+        command + prefer_binary + ["--only-binary=:all:"] + constraints,
+        command + prefer_binary + constraints,
     ]
+    if constraints:
+        # O requirements.txt pode ter mudado e conflitar com as versões fixadas
+        attempts.append(command + prefer_binary)
+    
+    for attempt in attempts:
+        try:
+            run_streaming(attempt)
+            break
+        except subprocess.CalledProcessError as e:
+            error = e
+            print_warning(f"Tentativa falhou ({' '.join(attempt[len(pip_install):])}), tentando novamente...")
+    else:
+        print_error(f"Erro ao instalar dependências: {error}")
+        return False
     
-    print_info(f"Instalando: {', '.join(dev_tools)}")
+    print_success("Dependências instaladas com sucesso")
+    if include_dev_tools:
+        # pytest faz parte de DEV_TOOLS; run_tests não precisa sondá-lo
+        _SETUP_CACHE['pytest_ok'] = True
+        print_success("Ferramentas de desenvolvimento instaladas")
     
+    save_constraints()
+    write_requirements_stamp(fingerprint)
+    return True
+
+
+def requirements_fingerprint(requirements_file, include_dev_tools):
+    """Hash do requirements.txt (e das ferramentas de dev, se incluídas)"""
+    digest = hashlib.blake2b(requirements_file.read_bytes())
+    if include_dev_tools:
+        digest.update("\n".join(DEV_TOOLS).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def read_requirements_stamp():
+    """Retorna (hash, sys.prefix) da última instalação, ou None"""
     try:
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install"
-        ] + dev_tools)
-        
-        print_success("Ferramentas de desenvolvimento instaladas")
-        return True
+        lines = REQUIREMENTS_STAMP.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+    return tuple(lines) if len(lines) == 2 else None
+
+
+def write_requirements_stamp(fingerprint):
+    """Grava o hash e o ambiente atual de forma atômica (tmp + os.replace)"""
+    try:
+        SETUP_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = REQUIREMENTS_STAMP.with_suffix(".tmp")
+        tmp_file.write_text(f"{fingerprint}\n{sys.prefix}\n", encoding="utf-8")
+        os.replace(tmp_file, REQUIREMENTS_STAMP)
+    except OSError as e:
+        print_warning(f"Não foi possível salvar {REQUIREMENTS_STAMP}: {e}")
+
+
+def save_constraints():
+    """Salva as versões instaladas (pip freeze) para as próximas execuções"""
+    try:
+        result = subprocess.run(
+            pip_command("freeze") + ["--exclude-editable"],
+            capture_output=True, text=True, check=True
+        )
+        # Referências diretas (pacote @ url) não são aceitas como constraint
+        pins = [line for line in result.stdout.splitlines() if line and " @ " not in line]
         
-    except subprocess.CalledProcessError as e:
-        print_error(f"Erro ao instalar ferramentas de dev: {e}")
-        return False
+        SETUP_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        CONSTRAINTS_FILE.write_text("\n".join(pins) + "\n", encoding="utf-8")
+    except (OSError, subprocess.CalledProcessError) as e:
+        print_warning(f"Não foi possível salvar {CONSTRAINTS_FILE}: {e}")
 
 
-def setup_precommit():
+def setup_precommit(enabled=True):
     """Configura pre-commit hooks"""
     print_header("Configurando Pre-commit Hooks (Opcional)")
     
-    response = input("Configurar pre-commit hooks? (S/n): ").strip().lower()
-    
-    if response == 'n':
+    if not enabled:
         print_info("Pulando pre-commit hooks")
         return True
     
     try:
+        sys.stdout.flush()
+        
         # Instalar pre-commit
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", "pre-commit"
-        ], stdout=subprocess.DEVNULL)
+        subprocess.check_call(
+            pip_command("install") + ["pre-commit"], stdout=subprocess.DEVNULL
+        )
         
         # Instalar hooks
         subprocess.check_call(["pre-commit", "install"])
@@ -229,26 +438,27 @@ def setup_precommit():
         return False
 
 
-def run_tests():
+def run_tests(enabled=True):
     """Executa testes iniciais"""
     print_header("Executando Testes Iniciais")
     
-    response = input("Executar testes? (S/n): ").strip().lower()
-    
-    if response == 'n':
+    if not enabled:
         print_info("Pulando testes")
         return True
     
-    # Verificar se pytest está instalado
+    # Verificar se pytest está instalado (dispensado se acabou de ser instalado)
     try:
-        subprocess.check_call([
-            sys.executable, "-m", "pytest", "--version"
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if not _SETUP_CACHE.get('pytest_ok'):
+            subprocess.check_call([
+                sys.executable, "-m", "pytest", "--version"
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            _SETUP_CACHE['pytest_ok'] = True
     except subprocess.CalledProcessError:
         print_warning("pytest não instalado, executando teste básico")
         test_file = Path("test_carteira_ideal.py")
         if test_file.exists():
             try:
+                sys.stdout.flush()
                 subprocess.check_call([sys.executable, str(test_file)])
                 print_success("Teste básico passou")
                 return True
@@ -262,6 +472,7 @@ def run_tests():
     # Executar pytest
     try:
         print_info("Executando pytest...")
+        sys.stdout.flush()
         subprocess.check_call([sys.executable, "-m", "pytest", "-v"])
         print_success("Todos os testes passaram")
         return True
@@ -274,8 +485,6 @@ def print_final_instructions():
     """Imprime instruções finais"""
     print_header("Setup Completo! 🎉")
     
-    print(f"{Colors.OKGREEN}{Colors.BOLD}Próximos Passos:{Colors.ENDC}\n")
-    
     steps = [
         "1. Edite o arquivo .env com suas credenciais de API",
         "2. Execute 'python test_carteira_ideal.py' para validar",
@@ -284,11 +493,6 @@ def print_final_instructions():
         "5. Confira boaspraticas.md para guidelines de desenvolvimento",
     ]
     
-    for step in steps:
-        print(f"   {Colors.OKCYAN}{step}{Colors.ENDC}")
-    
-    print(f"\n{Colors.OKGREEN}{Colors.BOLD}Recursos Úteis:{Colors.ENDC}\n")
-    
     resources = [
         "📖 README.md - Documentação principal",
         "📋 CHANGELOG.md - Histórico de versões",
@@ -297,11 +501,6 @@ def print_final_instructions():
         "📚 boaspraticas.md - Guia de desenvolvimento",
     ]
     
-    for resource in resources:
-        print(f"   {resource}")
-    
-    print(f"\n{Colors.OKGREEN}{Colors.BOLD}Comandos Úteis:{Colors.ENDC}\n")
-    
     commands = [
         "pytest                    # Executar testes",
         "black core/ apis/        # Formatar código",
@@ -309,16 +508,68 @@ def print_final_instructions():
         "python __version__.py    # Ver versão do sistema",
     ]
     
-    for command in commands:
-        print(f"   {Colors.OKCYAN}$ {command}{Colors.ENDC}")
+    title = f"{Colors.OKGREEN}{Colors.BOLD}{{}}{Colors.ENDC}"
+    bar = f"{Colors.HEADER}{'='*60}{Colors.ENDC}"
+    
+    # Monta todas as linhas e escreve de uma vez
+    lines = [title.format("Próximos Passos:"), ""]
+    lines += [f"   {Colors.OKCYAN}{step}{Colors.ENDC}" for step in steps]
+    lines += ["", title.format("Recursos Úteis:"), ""]
+    lines += [f"   {resource}" for resource in resources]
+    lines += ["", title.format("Comandos Úteis:"), ""]
+    lines += [f"   {Colors.OKCYAN}$ {command}{Colors.ENDC}" for command in commands]
+    lines += [
+        "",
+        bar,
+        f"{Colors.OKGREEN}Sistema pronto para uso! Versão 1.1.0{Colors.ENDC}",
+        bar,
+        "",
+    ]
     
-    print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
-    print(f"{Colors.OKGREEN}Sistema pronto para uso! Versão 1.1.0{Colors.ENDC}")
-    print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}\n")
-
-
-def main():
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def parse_args(argv=None):
+    """Lê as opções de linha de comando que respondem às perguntas do setup"""
+    parser = argparse.ArgumentParser(
+        description="Setup - Sistema de Análise de Portfólios v1.1.0"
+    )
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="Responde a todas as perguntas com o padrão")
+    parser.add_argument("--no-dev", dest="dev", action="store_false", default=None,
+                        help="Não instala as ferramentas de desenvolvimento")
+    parser.add_argument("--overwrite-env", dest="overwrite_env", action="store_true", default=None,
+                        help="Sobrescreve o .env existente sem perguntar")
+    parser.add_argument("--no-precommit", dest="precommit", action="store_false", default=None,
+                        help="Não configura os pre-commit hooks")
+    parser.add_argument("--no-tests", dest="tests", action="store_false", default=None,
+                        help="Não executa os testes iniciais")
+    parser.add_argument("--non-interactive", action="store_true",
+                        help="Nunca lê do terminal (implica --yes)")
+    return parser.parse_args(argv)
+
+
+def _confirm(args, key, prompt, default=True):
+    """Resposta de uma pergunta: opção da linha de comando, padrão (--yes) ou input()"""
+    value = getattr(args, key, None)
+    if value is not None:
+        return value
+    if args.yes or args.non_interactive:
+        return default
+    
+    response = input(f"{prompt} {'(S/n)' if default else '(s/N)'}: ").strip().lower()
+    return response != 'n' if default else response == 's'
+
+
+def main(argv=None):
     """Função principal"""
+    args = parse_args(argv)
+    if args.non_interactive:
+        # Qualquer input() esquecido recebe EOF em vez de travar a execução
+        sys.stdin = io.StringIO("")
+    
+    enable_buffered_stdout()
+    
     print_header("Setup - Sistema de Análise de Portfólios v1.1.0")
     
     print(f"{Colors.OKCYAN}Este script irá:{Colors.ENDC}")
@@ -329,24 +580,59 @@ def main():
     print("  • Configurar ferramentas de desenvolvimento (opcional)")
     print("  • Executar testes iniciais\n")
     
-    response = input(f"{Colors.BOLD}Continuar? (S/n): {Colors.ENDC}").strip().lower()
-    
-    if response == 'n':
+    sys.stdout.flush()
+    if not _confirm(args, "proceed", f"{Colors.BOLD}Continuar?{Colors.ENDC}"):
         print_info("Setup cancelado")
         return 1
     
-    steps = [
+    # Todas as perguntas são respondidas aqui: as etapas abaixo rodam sem
+    # interação (e em paralelo), e as ferramentas de dev entram na mesma
+    # execução do pip
+    include_dev_tools = _confirm(args, "dev", "Instalar ferramentas de desenvolvimento?")
+    if not include_dev_tools:
+        print_info("Pulando ferramentas de desenvolvimento")
+    
+    overwrite_env = False
+    if Path(".env").exists():
+        overwrite_env = _confirm(args, "overwrite_env", ".env já existe. Deseja sobrescrever?", default=False)
+    
+    configure_precommit = _confirm(args, "precommit", "Configurar pre-commit hooks?")
+    execute_tests = _confirm(args, "tests", "Executar testes?")
+    sys.stdout.flush()
+    
+    # Etapas independentes entre si rodam enquanto o pip instala as dependências
+    parallel_steps = [
         ("Versão do Python", check_python_version),
         ("Diretórios", create_directories),
-        ("Arquivo .env", create_env_file),
-        ("Dependências", install_dependencies),
-        ("Ferramentas de Dev", install_dev_tools),
-        ("Pre-commit Hooks", setup_precommit),
-        ("Testes", run_tests),
+        ("Arquivo .env", lambda: create_env_file(overwrite_env)),
+        ("Dependências", lambda: install_dependencies(include_dev_tools)),
+    ]
+    
+    # Etapas que dependem das dependências instaladas
+    steps = [
+        ("Pre-commit Hooks", lambda: setup_precommit(configure_precommit)),
+        ("Testes", lambda: run_tests(execute_tests)),
     ]
     
     failed_steps = []
     
+    try:
+        with ThreadPoolExecutor(max_workers=len(parallel_steps)) as executor:
+            futures = [(name, executor.submit(func)) for name, func in parallel_steps]
+            wait([future for _, future in futures])
+    except KeyboardInterrupt:
+        print_error("\n\nSetup interrompido pelo usuário")
+        return 1
+    
+    for step_name, future in futures:
+        try:
+            if not future.result():
+                failed_steps.append(step_name)
+        except Exception as e:
+            print_error(f"\nErro inesperado em {step_name}: {e}")
+            failed_steps.append(step_name)
+    sys.stdout.flush()
+    
     for step_name, step_func in steps:
         try:
             if not step_func():
@@ -357,6 +643,8 @@ def main():
         except Exception as e:
             print_error(f"\nErro inesperado em {step_name}: {e}")
             failed_steps.append(step_name)
+        finally:
+            sys.stdout.flush()
     
     if failed_steps:
         print_warning(f"\nAlgumas etapas falharam: {', '.join(failed_steps)}")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kernels numéricos do Data Manager
+Compilados com numba quando instalado; caso contrário, numpy vetorizado
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _price_changes_numpy(prices: np.ndarray, previous: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Variação absoluta e percentual de cada preço em relação ao fechamento anterior"""
+    change = prices - previous
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_pct = np.where(previous != 0.0, change / previous * 100.0, np.nan)
+    return change, change_pct
+
+
+if numba is not None:
+    # Sem fastmath: os NaN marcam fechamentos anteriores ausentes
+    @numba.njit(cache=True)
+    def _price_changes_jit(prices, previous):
+        n = prices.shape[0]
+        change = np.empty(n, dtype=np.float64)
+        change_pct = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            prev = previous[i]
+            change[i] = prices[i] - prev
+            if prev != 0.0:
+                change_pct[i] = change[i] / prev * 100.0
+            else:
+                change_pct[i] = np.nan
+        return change, change_pct
+
+    compute_price_changes = _price_changes_jit
+else:
+    compute_price_changes = _price_changes_numpy
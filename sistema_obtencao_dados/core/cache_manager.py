@@ -5,42 +5,239 @@ Gerenciador de Cache Robusto
 Cache em memória + persistente com backup automático
 """
 
-import json
+import contextlib
+import fnmatch
+import math
 import os
+import re
 import shutil
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, List
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, List, Set, Tuple
 from pathlib import Path
 import logging
 import hashlib
+import heapq
 import pickle
-import gzip
+import tarfile
 
-from ..models.data_models import CacheEntry, DataType, DataSource, DataQuality
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+try:
+    from readerwriterlock import rwlock
+except ImportError:
+    rwlock = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from enum import Enum
+
+from ..models.data_models import (
+    CacheEntry, DataType, DataSource, DataQuality, PriceData, ExchangeRate
+)
 
 logger = logging.getLogger(__name__)
 
+# A partir de quantos arquivos a carga do cache persistente usa várias threads
+PARALLEL_LOAD_THRESHOLD = 64
+
+PICKLE_PROTOCOL = 5
+
+# Subdiretório (versionado) com os arquivos das entradas: o diretório configurado
+# pode ter outros arquivos (do formato JSON antigo ou do usuário), que ficam intocados
+ENTRIES_DIR = "entries_v2"
+
+
+class PickleSerializer:
+    """
+    Serializa as entradas em pickle (padrão)
+    
+    Os dados são objetos Python (PriceData, DataFrames...) que o JSON não
+    representa. Só são lidos arquivos que o próprio CacheManager gravou no
+    seu diretório.
+    """
+    suffix = ".pkl"
+    
+    def dumps(self, obj: Any) -> bytes:
+        return pickle.dumps(obj, protocol=PICKLE_PROTOCOL)
+    
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class MsgpackSerializer:
+    """
+    Serializa as entradas em msgpack (storage_type: "msgpack")
+    
+    Mais rápido e sem executar código na leitura, mas só para dados simples:
+    além dos tipos do msgpack, restaura datetime e os modelos registrados em
+    EXT_TYPES; Enum é gravado como o seu valor.
+    """
+    suffix = ".msgpack"
+    
+    EXT_DATETIME = 1
+    EXT_TYPES = {PriceData: 2, ExchangeRate: 3}
+    
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack não está instalado")
+        self._types_by_code = {code: cls for cls, code in self.EXT_TYPES.items()}
+    
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return msgpack.ExtType(self.EXT_DATETIME, obj.isoformat().encode())
+        code = self.EXT_TYPES.get(type(obj))
+        if code is not None:
+            return msgpack.ExtType(code, self.dumps(obj.to_dict()))
+        if isinstance(obj, Enum):
+            return obj.value
+        raise TypeError(f"Tipo não suportado pelo msgpack: {type(obj).__name__}")
+    
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == self.EXT_DATETIME:
+            return datetime.fromisoformat(data.decode())
+        cls = self._types_by_code.get(code)
+        if cls is not None:
+            return cls.from_dict(self.loads(data))
+        return msgpack.ExtType(code, data)
+    
+    def dumps(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, default=self._default, use_bin_type=True)
+    
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+
+SERIALIZERS = {'pickle': PickleSerializer, 'msgpack': MsgpackSerializer}
+
+
+class AdaptiveTTL:
+    """
+    Política de TTL que cresce para as chaves procuradas com frequência
+    
+    Se uma chave volta a ser gravada até um TTL depois de expirar (alguém a
+    pediu de novo logo), o TTL cresce `growth` vezes, até max_ttl; se demorou
+    mais que isso, volta ao expires_in pedido. Só vale para os data_types
+    informados; os demais mantêm o TTL fixo. Chamada com o lock do cache.
+    """
+    
+    def __init__(self, data_types: Iterable[DataType] = (DataType.FUND,),
+                 max_ttl: int = 86400, growth: float = 1.5, max_keys: int = 10000):
+        self.data_types = frozenset(data_types)
+        self.max_ttl = max_ttl
+        self.growth = growth
+        self.max_keys = max_keys
+        # chave -> (último TTL, instante monotônico do set), em ordem de uso
+        self._history: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+    
+    def __call__(self, key: str, data_type: DataType, expires_in: int) -> int:
+        if data_type not in self.data_types:
+            return expires_in
+        
+        now = time.monotonic()
+        ttl = expires_in
+        previous = self._history.pop(key, None)
+        if previous is not None:
+            previous_ttl, set_at = previous
+            if now - set_at <= 2 * previous_ttl:
+                ttl = int(min(self.max_ttl, max(expires_in, previous_ttl * self.growth)))
+        
+        self._history[key] = (ttl, now)
+        if len(self._history) > self.max_keys:
+            self._history.popitem(last=False)
+        return ttl
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    """Grava num temporário no mesmo diretório e troca com os.replace"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class _Stats:
+    """Contadores do cache como atributos (sem hash de string a cada incremento)"""
+    __slots__ = ('hits', 'misses', 'sets', 'deletes', 'backups', 'last_backup')
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.deletes = 0
+        self.backups = 0
+        self.last_backup: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para dicionário"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compila (uma vez por padrão) o glob usado em get_keys"""
+    return re.compile(fnmatch.translate(pattern))
+
+
+@lru_cache(maxsize=4096)
+def _entry_file_names(key: str, suffix: str) -> Tuple[str, ...]:
+    """Nomes do arquivo de uma chave (hash não criptográfico), calculados uma vez por chave"""
+    encoded = key.encode()
+    legacy_name = f"{hashlib.md5(encoded).hexdigest()}{suffix}"
+    if xxhash is None:
+        return (legacy_name,)
+    return (f"{xxhash.xxh3_64_hexdigest(encoded)}{suffix}", legacy_name)
+
+
 class CacheManager:
     """
     Gerenciador de cache robusto com múltiplas camadas
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], serializer: Optional[Any] = None,
+                 ttl_policy: Optional[Callable[[str, DataType, int], int]] = None):
         """
         Inicializa o gerenciador de cache
         
         Args:
             config: Configurações do cache
+            serializer: Objeto com suffix, dumps e loads para as entradas no
+                disco; por padrão, escolhido por persistent.storage_type
+            ttl_policy: Função (chave, data_type, expires_in) -> TTL consultada
+                em set(); por padrão, AdaptiveTTL se adaptive_ttl.enabled
         """
         self.config = config
-        self.memory_cache: Dict[str, CacheEntry] = {}
+        self.serializer = serializer if serializer is not None else self._make_serializer(
+            config['persistent'].get('storage_type', 'pickle')
+        )
+        self.ttl_policy = ttl_policy if ttl_policy is not None else self._make_ttl_policy(
+            config.get('adaptive_ttl')
+        )
+        # Ordem de uso: a entrada menos recente fica no início (LRU)
+        self.memory_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self.persistent_cache_dir = Path(config['persistent']['directory'])
+        self.entries_dir = self.persistent_cache_dir / ENTRIES_DIR
         self.backup_dir = self.persistent_cache_dir / "backups"
         
         # Criar diretórios se não existirem
-        self.persistent_cache_dir.mkdir(parents=True, exist_ok=True)
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
         
         # Configurações
@@ -49,139 +246,141 @@ class CacheManager:
         self.backup_enabled = config['persistent']['backup_enabled']
         self.backup_interval = config['persistent']['backup_interval']
         
-        # Threading
-        self.lock = threading.RLock()
-        self._cleanup_thread = None
-        self._backup_thread = None
-        self._running = False
+        # Threading (nenhum método readquire o lock, então não precisa ser RLock)
+        self.lock = threading.Lock()
+        # Com o readerwriterlock, get/get_many/peek/exists/get_keys/get_stats
+        # rodam em paralelo; só quem altera o cache pega o lado de escrita
+        self._rwlock = rwlock.RWLockFair() if rwlock is not None else None
+        # Entre leitores, a ordem do LRU e os contadores de hit/miss mudam sob
+        # este lock curto; sem o RWLock o próprio self.lock já é exclusivo
+        self._lru_lock = threading.Lock() if self._rwlock is not None else contextlib.nullcontext()
+        # Serializa a escrita em disco, feita fora do lock da memória; quando
+        # os dois são necessários, este é adquirido primeiro
+        self._persist_lock = threading.Lock()
+        self._maintenance_thread = None
+        self._stop_event = threading.Event()
+        
+        # Chaves alteradas desde a última gravação; a thread de limpeza as
+        # grava em lote, tirando o disco do caminho de set()/delete()
+        self._dirty_keys: Set[str] = set()
+        
+        # (expires_at_mono, chave) das entradas com expiração: a limpeza só
+        # olha o topo do heap em vez de percorrer o cache inteiro
+        self._expiry_heap: List[Tuple[float, str]] = []
         
         # Estatísticas
-        self.stats = {
-            'hits': 0,
-            'misses': 0,
-            'sets': 0,
-            'deletes': 0,
-            'backups': 0,
-            'last_backup': None
-        }
-        
-        # Iniciar threads de manutenção
-        self._start_maintenance_threads()
+        self.stats = _Stats()
+        
+        # Iniciar thread de manutenção
+        self._start_maintenance_thread()
         
         # Carregar cache persistente
         self._load_persistent_cache()
         
         logger.info(f"Cache Manager inicializado - Memória: {self.max_memory_size} itens")
     
-    def _start_maintenance_threads(self):
-        """Inicia threads de manutenção do cache"""
-        self._running = True
-        
-        # Thread de limpeza
-        self._cleanup_thread = threading.Thread(
-            target=self._cleanup_worker,
+    @staticmethod
+    def _make_serializer(storage_type: str) -> Any:
+        """Serializador configurado, com pickle como alternativa"""
+        serializer_cls = SERIALIZERS.get(storage_type)
+        if serializer_cls is None:
+            logger.warning(f"storage_type '{storage_type}' não suportado; usando pickle")
+            return PickleSerializer()
+        try:
+            return serializer_cls()
+        except ImportError as e:
+            logger.warning(f"{e}; usando pickle")
+            return PickleSerializer()
+    
+    def _reading(self):
+        """Lock para operações só de leitura (compartilhado quando há RWLock)"""
+        if self._rwlock is not None:
+            return self._rwlock.gen_rlock()
+        return self.lock
+    
+    def _writing(self):
+        """Lock exclusivo para operações que alteram o cache"""
+        if self._rwlock is not None:
+            return self._rwlock.gen_wlock()
+        return self.lock
+    
+    def _start_maintenance_thread(self):
+        """Inicia a thread de manutenção (limpeza e backup) do cache"""
+        self._stop_event.clear()
+        self._maintenance_thread = threading.Thread(
+            target=self._maintenance_worker,
             daemon=True,
-            name="CacheCleanup"
+            name="CacheMaintenance"
         )
-        self._cleanup_thread.start()
-        
-        # Thread de backup
-        if self.backup_enabled:
-            self._backup_thread = threading.Thread(
-                target=self._backup_worker,
-                daemon=True,
-                name="CacheBackup"
-            )
-            self._backup_thread.start()
+        self._maintenance_thread.start()
         
-        logger.info("Threads de manutenção do cache iniciadas")
+        logger.info("Thread de manutenção do cache iniciada")
     
-    def _cleanup_worker(self):
-        """Worker para limpeza automática do cache"""
-        while self._running:
-            try:
-                time.sleep(self.cleanup_interval)
-                self._cleanup_expired_entries()
-            except Exception as e:
-                logger.error(f"Erro na limpeza do cache: {e}")
-    
-    def _backup_worker(self):
-        """Worker para backup automático do cache"""
-        while self._running:
-            try:
-                time.sleep(self.backup_interval)
-                self._create_backup()
-            except Exception as e:
-                logger.error(f"Erro no backup do cache: {e}")
+    def _maintenance_worker(self):
+        """Worker único para limpeza e backup automáticos do cache"""
+        next_cleanup = time.monotonic() + self.cleanup_interval
+        next_backup = time.monotonic() + self.backup_interval if self.backup_enabled else math.inf
+        
+        # Dorme até a próxima tarefa; shutdown() acorda a thread na hora pelo evento
+        while not self._stop_event.wait(max(0.0, min(next_cleanup, next_backup) - time.monotonic())):
+            now = time.monotonic()
+            
+            if now >= next_cleanup:
+                try:
+                    self._cleanup_expired_entries()
+                    self._flush_dirty()
+                except Exception as e:
+                    logger.error(f"Erro na limpeza do cache: {e}")
+                next_cleanup = now + self.cleanup_interval
+            
+            if now >= next_backup:
+                try:
+                    self._create_backup()
+                except Exception as e:
+                    logger.error(f"Erro no backup do cache: {e}")
+                next_backup = now + self.backup_interval
     
     def _cleanup_expired_entries(self):
         """Remove entradas expiradas do cache"""
-        with self.lock:
-            current_time = datetime.now()
+        with self._writing():
+            # Um único instante para comparar todas as entradas
+            now = time.monotonic()
             expired_keys = []
             
-            # Verificar cache em memória
-            for key, entry in self.memory_cache.items():
-                if entry.is_expired():
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now:
+                expires_at_mono, key = heapq.heappop(heap)
+                entry = self.memory_cache.get(key)
+                # Itens de entradas já regravadas, removidas ou descartadas são ignorados
+                if entry is not None and entry.expires_at_mono == expires_at_mono:
+                    del self.memory_cache[key]
+                    self._dirty_keys.add(key)
                     expired_keys.append(key)
-            
-            # Remover entradas expiradas
-            for key in expired_keys:
-                del self.memory_cache[key]
-                self.stats['deletes'] += 1
-            
-            # Limpar cache persistente expirado
-            self._cleanup_persistent_cache()
+                    self.stats.deletes += 1
             
             if expired_keys:
                 logger.info(f"Removidas {len(expired_keys)} entradas expiradas do cache")
     
-    def _cleanup_persistent_cache(self):
-        """Limpa entradas expiradas do cache persistente"""
-        try:
-            for cache_file in self.persistent_cache_dir.glob("*.json"):
-                if cache_file.name == "cache_index.json":
-                    continue
-                
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        entry_data = json.load(f)
-                    
-                    entry = CacheEntry.from_dict(entry_data)
-                    if entry.is_expired():
-                        cache_file.unlink()
-                        logger.debug(f"Removido arquivo de cache expirado: {cache_file.name}")
-                
-                except Exception as e:
-                    logger.warning(f"Erro ao processar arquivo de cache {cache_file}: {e}")
-        
-        except Exception as e:
-            logger.error(f"Erro na limpeza do cache persistente: {e}")
-    
     def _create_backup(self):
-        """Cria backup do cache persistente"""
+        """Cria backup do cache persistente (tar.zst, ou tar.gz sem o zstandard)"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = self.backup_dir / f"cache_backup_{timestamp}.tar.gz"
-            
-            # Criar arquivo tar.gz com todos os arquivos de cache
-            with open(backup_file, 'wb') as f:
-                with gzip.open(f, 'wt') as gz:
-                    for cache_file in self.persistent_cache_dir.glob("*.json"):
-                        if cache_file.name == "cache_index.json":
-                            continue
-                        
-                        try:
-                            with open(cache_file, 'r', encoding='utf-8') as cf:
-                                content = cf.read()
-                                gz.write(f"{cache_file.name}\n")
-                                gz.write(content)
-                                gz.write("\n")
-                        except Exception as e:
-                            logger.warning(f"Erro ao incluir {cache_file} no backup: {e}")
-            
-            self.stats['backups'] += 1
-            self.stats['last_backup'] = datetime.now()
+            cache_files = list(self.entries_dir.glob(f"*{self.serializer.suffix}"))
+            
+            # tar em modo stream: os arquivos vão do disco direto para o compressor
+            if zstd is not None:
+                backup_file = self.backup_dir / f"cache_backup_{timestamp}.tar.zst"
+                compressor = zstd.ZstdCompressor(level=3, threads=-1)
+                with open(backup_file, 'wb') as f, compressor.stream_writer(f) as zf, \
+                        tarfile.open(fileobj=zf, mode='w|') as tar:
+                    self._add_to_backup(tar, cache_files)
+            else:
+                backup_file = self.backup_dir / f"cache_backup_{timestamp}.tar.gz"
+                with tarfile.open(str(backup_file), 'w|gz') as tar:
+                    self._add_to_backup(tar, cache_files)
+            
+            self.stats.backups += 1
+            self.stats.last_backup = datetime.now()
             
             # Manter apenas os últimos 5 backups
             self._cleanup_old_backups()
@@ -191,65 +390,146 @@ class CacheManager:
         except Exception as e:
             logger.error(f"Erro ao criar backup do cache: {e}")
     
+    def _add_to_backup(self, tar: tarfile.TarFile, cache_files: List[Path]):
+        """Adiciona os arquivos de cache ao tar do backup"""
+        for cache_file in cache_files:
+            try:
+                tar.add(cache_file, arcname=cache_file.name)
+            except OSError as e:
+                logger.warning(f"Erro ao incluir {cache_file} no backup: {e}")
+    
     def _cleanup_old_backups(self):
         """Remove backups antigos, mantendo apenas os últimos 5"""
         try:
-            backup_files = sorted(self.backup_dir.glob("cache_backup_*.tar.gz"))
+            # O nome começa pelo timestamp, então a ordem vale entre .tar.gz e .tar.zst
+            backup_files = sorted(self.backup_dir.glob("cache_backup_*.tar.*"))
             if len(backup_files) > 5:
                 for old_backup in backup_files[:-5]:
                     old_backup.unlink()
-                    logger.debug(f"Backup antigo removido: {old_backup}")
+                    logger.debug("Backup antigo removido: %s", old_backup)
         
         except Exception as e:
             logger.error(f"Erro ao limpar backups antigos: {e}")
     
     def _load_persistent_cache(self):
-        """Carrega cache persistente na memória"""
+        """Carrega cache persistente na memória a partir dos arquivos das entradas"""
         try:
-            index_file = self.persistent_cache_dir / "cache_index.json"
-            if not index_file.exists():
-                return
+            # Só entries_dir é do CacheManager: o formato JSON anterior, no diretório
+            # configurado, não é lido nem apagado (o cache é refeito sob demanda)
             
-            with open(index_file, 'r', encoding='utf-8') as f:
-                index_data = json.load(f)
+            # Temporários de gravações interrompidas
+            for tmp_file in self.entries_dir.glob("*.tmp"):
+                tmp_file.unlink(missing_ok=True)
+            # Entradas gravadas com outro serializador
+            for serializer_cls in SERIALIZERS.values():
+                if serializer_cls.suffix != self.serializer.suffix:
+                    for other_file in self.entries_dir.glob(f"*{serializer_cls.suffix}"):
+                        other_file.unlink(missing_ok=True)
             
-            # Carregar apenas entradas não expiradas
-            loaded_count = 0
-            for key, entry_data in index_data.items():
-                try:
-                    entry = CacheEntry.from_dict(entry_data)
-                    if not entry.is_expired():
-                        self.memory_cache[key] = entry
-                        loaded_count += 1
-                except Exception as e:
-                    logger.warning(f"Erro ao carregar entrada do cache: {e}")
+            cache_files = list(self.entries_dir.glob(f"*{self.serializer.suffix}"))
+            if len(cache_files) >= PARALLEL_LOAD_THRESHOLD:
+                # A leitura dos arquivos libera o GIL; a memória só é tocada no final
+                workers = min(16, (os.cpu_count() or 1) * 2)
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="CacheLoad") as executor:
+                    loaded = list(executor.map(self._load_entry_file, cache_files))
+            else:
+                loaded = [self._load_entry_file(cache_file) for cache_file in cache_files]
+            
+            now = time.monotonic()
+            entries = []
+            for cache_file, entry in zip(cache_files, loaded):
+                if entry is None:
+                    continue
+                
+                if entry.is_expired(now):
+                    cache_file.unlink(missing_ok=True)
+                    logger.debug("Removido arquivo de cache expirado: %s", cache_file.name)
+                else:
+                    entries.append(entry)
             
-            logger.info(f"Cache persistente carregado: {loaded_count} entradas")
+            # Da mais antiga para a mais recente, respeitando o limite da memória;
+            # as que sobram saem do disco no próximo flush
+            entries.sort(key=lambda entry: entry.timestamp)
+            overflow = entries[:-self.max_memory_size] if len(entries) > self.max_memory_size else []
+            with self._writing():
+                for entry in overflow:
+                    self._dirty_keys.add(entry.key)
+                for entry in entries[len(overflow):]:
+                    self.memory_cache[entry.key] = entry
+                    if entry.expires_at_mono != math.inf:
+                        heapq.heappush(self._expiry_heap, (entry.expires_at_mono, entry.key))
+            
+            logger.info(f"Cache persistente carregado: {len(entries) - len(overflow)} entradas")
         
         except Exception as e:
             logger.error(f"Erro ao carregar cache persistente: {e}")
     
-    def _save_persistent_cache(self):
-        """Salva cache em memória no disco"""
+    def _load_entry_file(self, cache_file: Path) -> Optional[CacheEntry]:
+        """Lê um arquivo de entrada do cache persistente (None se inválido)"""
+        try:
+            return CacheEntry.from_dict(self.serializer.loads(cache_file.read_bytes()))
+        except Exception as e:
+            logger.warning(f"Erro ao carregar entrada do cache {cache_file}: {e}")
+            return None
+    
+    def _flush_dirty(self):
+        """Grava no disco as entradas alteradas desde o último flush"""
+        # Flushes concorrentes (manutenção e shutdown) gravam na ordem dos snapshots
+        with self._persist_lock:
+            with self._writing():
+                if not self._dirty_keys:
+                    return
+                
+                dirty_keys, self._dirty_keys = self._dirty_keys, set()
+                changed = [(key, self.memory_cache.get(key)) for key in dirty_keys]
+            
+            # Disco fora do lock da memória: get/set não esperam pela gravação
+            for key, entry in changed:
+                if entry is None:
+                    self._remove_entry_file(key)
+                else:
+                    self._persist_entry(key, entry)
+    
+    def _persist_entry(self, key: str, entry: CacheEntry):
+        """Grava no disco apenas o arquivo da entrada alterada"""
         try:
-            # Salvar entradas individuais
-            for key, entry in self.memory_cache.items():
-                cache_file = self.persistent_cache_dir / f"{self._hash_key(key)}.json"
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(entry.to_dict(), f, ensure_ascii=False, indent=2)
-            
-            # Salvar índice
-            index_data = {key: entry.to_dict() for key, entry in self.memory_cache.items()}
-            index_file = self.persistent_cache_dir / "cache_index.json"
-            with open(index_file, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, ensure_ascii=False, indent=2)
+            # to_dict() e não a entrada em si: expires_at_mono só vale neste processo
+            content = self.serializer.dumps(entry.to_dict())
+            cache_file, *legacy_files = self._entry_files(key)
+            # Uma queda no meio da gravação nunca deixa um arquivo de entrada truncado
+            _write_atomic(cache_file, content)
+            
+            for legacy_file in legacy_files:
+                legacy_file.unlink(missing_ok=True)
         
         except Exception as e:
-            logger.error(f"Erro ao salvar cache persistente: {e}")
+            logger.error(f"Erro ao salvar entrada {key} no cache persistente: {e}")
+    
+    def _remove_entry_file(self, key: str):
+        """Remove do disco o arquivo de uma entrada apagada"""
+        for cache_file in self._entry_files(key):
+            try:
+                cache_file.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Erro ao remover arquivo de cache {cache_file}: {e}")
     
-    def _hash_key(self, key: str) -> str:
-        """Gera hash para o nome do arquivo de cache"""
-        return hashlib.md5(key.encode()).hexdigest()
+    def _entry_files(self, key: str) -> List[Path]:
+        """Arquivo da entrada, seguido do nome antigo (md5) quando o xxhash está em uso"""
+        return [
+            self.entries_dir / name
+            for name in _entry_file_names(key, self.serializer.suffix)
+        ]
+    
+    @staticmethod
+    def _make_ttl_policy(adaptive_config: Optional[Dict[str, Any]]) -> Optional[AdaptiveTTL]:
+        """AdaptiveTTL configurado em adaptive_ttl, ou None (TTL fixo)"""
+        if not adaptive_config or not adaptive_config.get('enabled', False):
+            return None
+        return AdaptiveTTL(
+            data_types=[DataType(value) for value in adaptive_config.get('data_types', ['fund'])],
+            max_ttl=adaptive_config.get('max_ttl', 86400),
+            growth=adaptive_config.get('growth', 1.5)
+        )
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -261,24 +541,73 @@ class CacheManager:
         Returns:
             Valor do cache ou None se não encontrado/expirado
         """
-        with self.lock:
-            if key in self.memory_cache:
-                entry = self.memory_cache[key]
-                
-                if entry.is_expired():
-                    del self.memory_cache[key]
-                    self.stats['misses'] += 1
-                    return None
-                
-                # Atualizar estatísticas de acesso
+        with self._reading():
+            # Caminho quente: uma única busca no dicionário
+            entry = self.memory_cache.get(key)
+            
+            # Entradas expiradas contam como ausentes; quem as remove é a limpeza
+            if entry is None or entry.expires_at_mono <= time.monotonic():
+                with self._lru_lock:
+                    self.stats.misses += 1
+                return None
+            
+            # Atualizar estatísticas de acesso (a ordem do LRU dispensa o
+            # last_accessed, que deixou de ser atualizado a cada leitura)
+            with self._lru_lock:
                 entry.access_count += 1
-                entry.last_accessed = datetime.now()
-                
-                self.stats['hits'] += 1
-                return entry.data
+                self.memory_cache.move_to_end(key)
+                self.stats.hits += 1
+            return entry.data
+    
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        Obtém valor do cache sem contar hit/miss nem alterar a ordem do LRU
+        
+        Args:
+            key: Chave do cache
             
-            self.stats['misses'] += 1
-            return None
+        Returns:
+            Valor do cache ou None se não encontrado/expirado
+        """
+        with self._reading():
+            # Entradas expiradas contam como ausentes; quem as remove é a limpeza
+            entry = self.memory_cache.get(key)
+            if entry is None or entry.expires_at_mono <= time.monotonic():
+                return None
+            return entry.data
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Obtém vários valores do cache com uma única aquisição do lock
+        
+        Args:
+            keys: Chaves do cache
+        
+        Returns:
+            Dicionário chave -> valor apenas com as chaves encontradas
+        """
+        found = {}
+        with self._reading():
+            memory_cache = self.memory_cache
+            now = time.monotonic()
+            
+            # Entradas expiradas contam como ausentes; quem as remove é a limpeza
+            hits = []
+            for key in keys:
+                entry = memory_cache.get(key)
+                if entry is not None and entry.expires_at_mono > now:
+                    hits.append(entry)
+                    found[key] = entry.data
+            
+            with self._lru_lock:
+                move_to_end = memory_cache.move_to_end
+                for entry in hits:
+                    entry.access_count += 1
+                    move_to_end(entry.key)
+                self.stats.hits += len(hits)
+                self.stats.misses += len(keys) - len(hits)
+        
+        return found
     
     def set(self, key: str, data: Any, data_type: DataType, 
             expires_in: Optional[int] = None, source: DataSource = DataSource.UNKNOWN,
@@ -294,47 +623,100 @@ class CacheManager:
             source: Fonte dos dados
             quality: Qualidade dos dados
         """
-        with self.lock:
-            # Calcular tempo de expiração
-            expires_at = None
-            if expires_in:
-                expires_at = datetime.now() + timedelta(seconds=expires_in)
+        with self._writing():
+            if expires_in and self.ttl_policy is not None:
+                expires_in = self.ttl_policy(key, data_type, expires_in)
+            
+            # Calcular tempo de expiração (o monotônico é derivado pela própria entrada)
+            now = datetime.now()
+            expires_at = now + timedelta(seconds=expires_in) if expires_in else None
             
             # Criar entrada do cache
             entry = CacheEntry(
                 key=key,
                 data=data,
                 data_type=data_type,
-                timestamp=datetime.now(),
+                timestamp=now,
                 expires_at=expires_at,
                 source=source,
-                quality=quality
+                quality=quality,
+                last_accessed=now
             )
             
-            # Verificar se há espaço no cache
-            if len(self.memory_cache) >= self.max_memory_size:
+            # Verificar se há espaço no cache (sobrescrever não ocupa espaço novo)
+            if key not in self.memory_cache and len(self.memory_cache) >= self.max_memory_size:
                 self._evict_least_used()
             
-            # Armazenar no cache
+            # Armazenar no cache como a entrada mais recente
             self.memory_cache[key] = entry
-            self.stats['sets'] += 1
+            self.memory_cache.move_to_end(key)
+            if expires_in:
+                heapq.heappush(self._expiry_heap, (entry.expires_at_mono, key))
+            self.stats.sets += 1
             
-            # Salvar no cache persistente
-            self._save_persistent_cache()
+            # Gravada no disco depois, em lote, pela thread de limpeza
+            self._dirty_keys.add(key)
+    
+    def set_many(self, items: Dict[str, Any], data_type: DataType,
+                 expires_in: Optional[int] = None, source: DataSource = DataSource.UNKNOWN,
+                 quality: DataQuality = DataQuality.UNKNOWN) -> None:
+        """
+        Armazena vários valores com os mesmos metadados numa única aquisição do lock
+        
+        Sem ttl_policy todo o lote compartilha o mesmo instante de expiração;
+        com ela o TTL é calculado chave a chave, como em set().
+        
+        Args:
+            items: Dicionário chave -> dados
+            data_type: Tipo dos dados
+            expires_in: Tempo de expiração em segundos
+            source: Fonte dos dados
+            quality: Qualidade dos dados
+        """
+        with self._writing():
+            # Um único instante de criação para todo o lote
+            now = datetime.now()
+            ttl_policy = self.ttl_policy if expires_in else None
+            expires_at = now + timedelta(seconds=expires_in) if expires_in else None
+            
+            memory_cache = self.memory_cache
+            for key, data in items.items():
+                if ttl_policy is not None:
+                    expires_at = now + timedelta(seconds=ttl_policy(key, data_type, expires_in))
+                
+                entry = CacheEntry(
+                    key=key,
+                    data=data,
+                    data_type=data_type,
+                    timestamp=now,
+                    expires_at=expires_at,
+                    source=source,
+                    quality=quality,
+                    last_accessed=now
+                )
+                
+                if key not in memory_cache and len(memory_cache) >= self.max_memory_size:
+                    self._evict_least_used()
+                
+                memory_cache[key] = entry
+                memory_cache.move_to_end(key)
+                if expires_in:
+                    heapq.heappush(self._expiry_heap, (entry.expires_at_mono, key))
+            
+            self.stats.sets += len(items)
+            # Gravadas no disco depois, em lote, pela thread de limpeza
+            self._dirty_keys.update(items)
     
     def _evict_least_used(self):
-        """Remove a entrada menos usada do cache (LRU)"""
+        """Remove a entrada usada há mais tempo do cache (LRU)"""
         if not self.memory_cache:
             return
         
-        # Encontrar entrada com menor contador de acesso
-        least_used_key = min(
-            self.memory_cache.keys(),
-            key=lambda k: self.memory_cache[k].access_count
-        )
-        
-        del self.memory_cache[least_used_key]
-        logger.debug(f"Entrada removida do cache (LRU): {least_used_key}")
+        # O início do OrderedDict é a entrada menos recente: O(1)
+        least_used_key, _ = self.memory_cache.popitem(last=False)
+        # O disco acompanha a memória: o arquivo sai no próximo flush
+        self._dirty_keys.add(least_used_key)
+        logger.debug("Entrada removida do cache (LRU): %s", least_used_key)
     
     def delete(self, key: str) -> bool:
         """
@@ -346,31 +728,30 @@ class CacheManager:
         Returns:
             True se removido, False se não encontrado
         """
-        with self.lock:
+        with self._writing():
             if key in self.memory_cache:
                 del self.memory_cache[key]
-                self.stats['deletes'] += 1
+                self.stats.deletes += 1
                 
-                # Remover do cache persistente
-                cache_file = self.persistent_cache_dir / f"{self._hash_key(key)}.json"
-                if cache_file.exists():
-                    cache_file.unlink()
-                
-                self._save_persistent_cache()
+                # O arquivo é removido no próximo flush
+                self._dirty_keys.add(key)
                 return True
             
             return False
     
     def clear(self) -> None:
         """Limpa todo o cache"""
-        with self.lock:
-            self.memory_cache.clear()
-            
-            # Limpar cache persistente
-            for cache_file in self.persistent_cache_dir.glob("*.json"):
-                cache_file.unlink()
+        with self._persist_lock:
+            with self._writing():
+                self.memory_cache.clear()
+                self._expiry_heap.clear()
+                self._dirty_keys.clear()
             
-            logger.info("Cache completamente limpo")
+            # Limpar cache persistente sem bloquear quem lê a memória
+            for cache_file in self.entries_dir.glob(f"*{self.serializer.suffix}"):
+                cache_file.unlink(missing_ok=True)
+        
+        logger.info("Cache completamente limpo")
     
     def exists(self, key: str) -> bool:
         """
@@ -382,14 +763,10 @@ class CacheManager:
         Returns:
             True se existe e não expirou
         """
-        with self.lock:
-            if key in self.memory_cache:
-                entry = self.memory_cache[key]
-                if entry.is_expired():
-                    del self.memory_cache[key]
-                    return False
-                return True
-            return False
+        with self._reading():
+            # Entradas expiradas contam como ausentes; quem as remove é a limpeza
+            entry = self.memory_cache.get(key)
+            return entry is not None and entry.expires_at_mono > time.monotonic()
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -398,12 +775,13 @@ class CacheManager:
         Returns:
             Dicionário com estatísticas
         """
-        with self.lock:
-            total_requests = self.stats['hits'] + self.stats['misses']
-            hit_rate = (self.stats['hits'] / total_requests * 100) if total_requests > 0 else 0
+        with self._reading(), self._lru_lock:
+            stats = self.stats
+            total_requests = stats.hits + stats.misses
+            hit_rate = (stats.hits / total_requests * 100) if total_requests > 0 else 0
             
             return {
-                **self.stats,
+                **stats.to_dict(),
                 'total_requests': total_requests,
                 'hit_rate': round(hit_rate, 2),
                 'memory_size': len(self.memory_cache),
@@ -411,38 +789,36 @@ class CacheManager:
                 'memory_usage_percent': round(len(self.memory_cache) / self.max_memory_size * 100, 2)
             }
     
-    def get_keys(self, pattern: Optional[str] = None) -> List[str]:
+    def get_keys(self, pattern: Optional[str] = None) -> Tuple[str, ...]:
         """
-        Obtém lista de chaves no cache
+        Obtém as chaves no cache
         
         Args:
             pattern: Padrão para filtrar chaves (opcional)
             
         Returns:
-            Lista de chaves
+            Tupla (cópia imutável, segura fora do lock) com as chaves
         """
-        with self.lock:
-            keys = list(self.memory_cache.keys())
+        with self._reading():
+            # Cópia sob o lock do LRU: get() reordena as chaves em paralelo
+            with self._lru_lock:
+                keys = tuple(self.memory_cache)
+            if not pattern:
+                return keys
             
-            if pattern:
-                import fnmatch
-                keys = [k for k in keys if fnmatch.fnmatch(k, pattern)]
-            
-            return keys
+            match = _compile_pattern(pattern).match
+            return tuple(k for k in keys if match(k))
     
     def shutdown(self):
         """Desliga o gerenciador de cache"""
-        self._running = False
-        
-        # Aguardar threads terminarem
-        if self._cleanup_thread and self._cleanup_thread.is_alive():
-            self._cleanup_thread.join(timeout=5)
+        self._stop_event.set()
         
-        if self._backup_thread and self._backup_thread.is_alive():
-            self._backup_thread.join(timeout=5)
+        # Aguardar a thread de manutenção terminar
+        if self._maintenance_thread and self._maintenance_thread.is_alive():
+            self._maintenance_thread.join(timeout=5)
         
-        # Salvar cache final
-        self._save_persistent_cache()
+        # Gravar o que ainda estava pendente
+        self._flush_dirty()
         
         logger.info("Cache Manager desligado")
     
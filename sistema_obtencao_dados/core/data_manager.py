@@ -7,40 +7,155 @@ Integra todos os providers com cache robusto e fallback inteligente
 
 import sys
 import os
+import copy
+import math
 import time
+import atexit
+import itertools
+import asyncio
 import logging
-import yaml
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple, Union
 from pathlib import Path
+from collections import defaultdict, deque
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 
 # Adicionar diretórios ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from .cache_manager import CacheManager
 from ..models.data_models import (
-    DataType, DataSource, DataQuality, PriceData, 
-    ExchangeRate, HistoricalData, DataRequest, DataResponse
+    DataType, DataSource, DataQuality, PriceData, PriceFrame,
+    ExchangeRate, HistoricalData, DataRequest, DataResponse, DATA_QUALITY_CODES
 )
-from ..providers.yahoo_finance_provider import YahooFinanceProvider
-from ..providers.fundos_provider import FundosProvider
 
 logger = logging.getLogger(__name__)
 
+# Moeda de cotação pelo sufixo de bolsa do símbolo (Yahoo); sem sufixo, USD
+CURRENCY_BY_SUFFIX = {'.SA': 'BRL'}
+
+
+def _infer_currency(symbol: str) -> str:
+    """Moeda de cotação do símbolo a partir do sufixo de bolsa"""
+    # Sem ponto, a fatia é só o último caractere e nunca coincide com um sufixo
+    return CURRENCY_BY_SUFFIX.get(symbol[symbol.rfind('.'):], 'USD')
+
+
+# Granularidade do relógio compartilhado pelos PriceData de um mesmo lote
+NOW_RESOLUTION = 0.05
+_now_cache = (-math.inf, datetime.now())
+
+
+def _coarse_now() -> datetime:
+    """datetime.now() reaproveitado por até NOW_RESOLUTION segundos"""
+    global _now_cache
+    mono = time.monotonic()
+    checked_at, now = _now_cache
+    if mono - checked_at >= NOW_RESOLUTION:
+        now = datetime.now()
+        # Atribuição única da tupla: leitores concorrentes nunca veem um par misturado
+        _now_cache = (mono, now)
+    return now
+
+
+# Por quanto tempo (segundos) get_stats reaproveita o último resultado
+STATS_TTL = 1.0
+
+# Formatos das chaves do cache, resolvidos uma vez como métodos ligados
+_STOCK_PRICE_KEY = "stock_price_{}".format
+_CRYPTO_PRICE_KEY = "crypto_price_{}".format
+_EXCHANGE_RATE_KEY = "exchange_rate_{}_{}".format
+
+# Fontes tentadas por tipo de dado, em ordem de preferência
+_SOURCES_BY_TYPE: Dict[DataType, Tuple[DataSource, ...]] = {
+    DataType.STOCK: (DataSource.YAHOO_FINANCE,),
+    DataType.CRYPTO: (DataSource.YAHOO_FINANCE, DataSource.BINANCE),
+    DataType.CURRENCY: (DataSource.YAHOO_FINANCE, DataSource.EXCHANGE_RATE_API)
+}
+
+# Provider e método que atendem cada fonte; fontes sem provider são ignoradas
+_SOURCE_METHODS: Dict[DataSource, Tuple[str, str]] = {
+    DataSource.YAHOO_FINANCE: ('yahoo_finance', 'get_stock_price')
+}
+
+
+# Executor compartilhado pelas instâncias, criado no primeiro uso e
+# encerrado só na saída do processo
+_GLOBAL_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_GLOBAL_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Retorna o executor compartilhado, criando-o se necessário"""
+    global _GLOBAL_EXECUTOR
+    if _GLOBAL_EXECUTOR is None:
+        with _GLOBAL_EXECUTOR_LOCK:
+            if _GLOBAL_EXECUTOR is None:
+                # Trabalho de I/O: mesmo dimensionamento padrão do ThreadPoolExecutor
+                _GLOBAL_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=min(32, (os.cpu_count() or 1) + 4),
+                    thread_name_prefix="DataManager"
+                )
+                atexit.register(_GLOBAL_EXECUTOR.shutdown, wait=True)
+    return _GLOBAL_EXECUTOR
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Interpreta o YAML uma vez; a mtime na chave descarta a versão antiga se o arquivo mudar"""
+    import yaml
+    
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+class _Counter:
+    """
+    Contador sem lock: next() de um itertools.count é atômico no CPython
+    
+    A leitura também consome um valor da contagem, descontado por _reads;
+    por isso as leituras (e só elas) precisam ser serializadas.
+    """
+    __slots__ = ('_count', '_reads', 'increment')
+    
+    def __init__(self):
+        self._count = itertools.count()
+        self._reads = itertools.count()
+        self.increment = self._count.__next__
+    
+    def add(self, n: int) -> None:
+        """Soma n à contagem"""
+        deque(itertools.islice(self._count, n), maxlen=0)
+    
+    @property
+    def value(self) -> int:
+        """Valor atual (chamar sob lock se houver leitores concorrentes)"""
+        return next(self._count) - next(self._reads)
+
+
 class DataManager:
     """
     Gerenciador central de dados financeiros
     Orquestra providers, cache e fallback inteligente
     """
+    __slots__ = (
+        'config', 'cache_manager', 'providers', 'timeout', 'retry_config',
+        'fallback_config', '_expiration_by_type', '_owns_executor', 'executor',
+        'lock', '_inflight', '_cnt_requests', '_cnt_cache_hits', '_cnt_cache_misses',
+        '_cnt_errors', '_cnt_fallbacks', '_provider_requests', '_stats_lock',
+        '_fetchers', '_provider_chain', '_stats_cache'
+    )
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, owned_executor: bool = False):
         """
         Inicializa o Data Manager
         
         Args:
             config_path: Caminho para arquivo de configuração
+            owned_executor: Usar um executor próprio (encerrado no shutdown)
+                em vez do compartilhado entre instâncias
         """
         self.config = self._load_config(config_path)
         self.cache_manager = CacheManager(self.config['cache'])
@@ -53,18 +168,47 @@ class DataManager:
         self.retry_config = self.config['retry']
         self.fallback_config = self.config['fallback']
         
+        # Expiração por tipo de dado, resolvida uma vez a partir da configuração
+        expiration_config = self.config['cache']['expiration']
+        self._expiration_by_type = {
+            DataType.STOCK: expiration_config['stock'],
+            DataType.CRYPTO: expiration_config['crypto'],
+            DataType.CURRENCY: expiration_config['currency'],
+            DataType.FUND: expiration_config['fund']
+        }
+        
         # Threading
-        self.executor = ThreadPoolExecutor(max_workers=10)
-        self.lock = threading.RLock()
-        
-        # Estatísticas
-        self.stats = {
-            'requests': 0,
-            'cache_hits': 0,
-            'cache_misses': 0,
-            'provider_requests': {},
-            'errors': 0,
-            'fallbacks': 0
+        self._owns_executor = owned_executor
+        self.executor = ThreadPoolExecutor(max_workers=10) if owned_executor else _get_executor()
+        # Só protege o mapa de buscas em andamento; nunca é readquirido, então não precisa ser RLock
+        self.lock = threading.Lock()
+        # Buscas em andamento por chave do cache (single-flight)
+        self._inflight: Dict[str, Future] = {}
+        
+        # Estatísticas (incrementadas sem lock; get_stats lê sob _stats_lock)
+        self._cnt_requests = _Counter()
+        self._cnt_cache_hits = _Counter()
+        self._cnt_cache_misses = _Counter()
+        self._cnt_errors = _Counter()
+        self._cnt_fallbacks = _Counter()
+        self._provider_requests: Dict[str, int] = defaultdict(int)
+        self._stats_lock = threading.Lock()
+        # (instante monotônico, resultado) do último get_stats
+        self._stats_cache: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
+        
+        # Cadeia de fallback por tipo de dado: (fonte, método do provider) já resolvidos
+        self._provider_chain = self._build_provider_chain()
+        
+        # Buscas especializadas por tipo de dado, geradas uma única vez
+        self._fetchers: Dict[DataType, Callable[..., Any]] = {
+            DataType.STOCK: self._build_fetcher(DataType.STOCK, _STOCK_PRICE_KEY),
+            DataType.CRYPTO: self._build_fetcher(DataType.CRYPTO, _CRYPTO_PRICE_KEY),
+            DataType.CURRENCY: self._build_fetcher(
+                DataType.CURRENCY,
+                _EXCHANGE_RATE_KEY,
+                symbol_format="{}{}=X".format,
+                label_format="{}/{}".format
+            )
         }
         
         logger.info("Data Manager inicializado com sucesso")
@@ -75,8 +219,11 @@ class DataManager:
             config_path = str(Path(__file__).parent.parent / "config.yaml")
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            config_path = os.path.abspath(config_path)
+            # Cópia: cada instância pode alterar a sua sem afetar o cache
+            config = copy.deepcopy(
+                _load_config_cached(config_path, os.stat(config_path).st_mtime_ns)
+            )
             logger.info(f"Configuração carregada de: {config_path}")
             return config
         except Exception as e:
@@ -85,6 +232,11 @@ class DataManager:
     
     def _initialize_providers(self) -> Dict[str, Any]:
         """Inicializa todos os providers configurados"""
+        # Importados aqui: os providers trazem requests, pandas e afins, que
+        # quem só usa o cache não precisa carregar
+        from ..providers.yahoo_finance_provider import YahooFinanceProvider
+        from ..providers.fundos_provider import FundosProvider
+        
         providers = {}
         
         # Yahoo Finance Provider
@@ -121,28 +273,7 @@ class DataManager:
         Returns:
             Dados de preço ou None se erro
         """
-        cache_key = f"stock_price_{symbol}"
-        
-        # Tentar cache primeiro (se não forçar refresh)
-        if not force_refresh:
-            cached_data = self.cache_manager.get(cache_key)
-            if cached_data:
-                self.stats['cache_hits'] += 1
-                logger.debug(f"Cache hit para {symbol}")
-                return cached_data
-        
-        self.stats['cache_misses'] += 1
-        self.stats['requests'] += 1
-        
-        # Buscar dados dos providers
-        data = self._fetch_from_providers(
-            symbol=symbol,
-            data_type=DataType.STOCK,
-            sources=[DataSource.YAHOO_FINANCE],
-            cache_key=cache_key
-        )
-        
-        return data
+        return self._fetchers[DataType.STOCK](symbol, force_refresh=force_refresh)
     
     def get_crypto_price(self, symbol: str, force_refresh: bool = False) -> Optional[PriceData]:
         """
@@ -155,28 +286,7 @@ class DataManager:
         Returns:
             Dados de preço ou None se erro
         """
-        cache_key = f"crypto_price_{symbol}"
-        
-        # Tentar cache primeiro
-        if not force_refresh:
-            cached_data = self.cache_manager.get(cache_key)
-            if cached_data:
-                self.stats['cache_hits'] += 1
-                logger.debug(f"Cache hit para {symbol}")
-                return cached_data
-        
-        self.stats['cache_misses'] += 1
-        self.stats['requests'] += 1
-        
-        # Buscar dados dos providers
-        data = self._fetch_from_providers(
-            symbol=symbol,
-            data_type=DataType.CRYPTO,
-            sources=[DataSource.YAHOO_FINANCE, DataSource.BINANCE],
-            cache_key=cache_key
-        )
-        
-        return data
+        return self._fetchers[DataType.CRYPTO](symbol, force_refresh=force_refresh)
     
     def get_exchange_rate(self, from_currency: str, to_currency: str, 
                          force_refresh: bool = False) -> Optional[ExchangeRate]:
@@ -191,28 +301,116 @@ class DataManager:
         Returns:
             Dados de câmbio ou None se erro
         """
-        cache_key = f"exchange_rate_{from_currency}_{to_currency}"
+        return self._fetchers[DataType.CURRENCY](
+            from_currency, to_currency, force_refresh=force_refresh
+        )
+    
+    def _build_provider_chain(self) -> Dict[DataType, List[Tuple[DataSource, Callable[[str], Any]]]]:
+        """Resolve, para cada tipo de dado, os métodos dos providers ativos em ordem de fallback"""
+        chain = {}
+        for data_type, sources in _SOURCES_BY_TYPE.items():
+            chain[data_type] = []
+            for source in sources:
+                if source not in _SOURCE_METHODS:
+                    continue
+                provider_name, method_name = _SOURCE_METHODS[source]
+                if provider_name in self.providers:
+                    chain[data_type].append((source, getattr(self.providers[provider_name], method_name)))
+        return chain
+    
+    def _build_fetcher(self, data_type: DataType, key_format: Callable[..., str],
+                       symbol_format: Optional[Callable[..., str]] = None,
+                       label_format: Optional[Callable[..., str]] = None) -> Callable[..., Any]:
+        """
+        Gera a função de busca de um tipo de dado
+        
+        Tipo e formatos da chave/símbolo ficam fixos no closure em vez de
+        serem montados a cada chamada.
+        
+        Args:
+            data_type: Tipo de dado
+            key_format: Monta a chave do cache a partir das partes
+            symbol_format: Monta o símbolo do provider (padrão: primeira parte)
+            label_format: Monta a identificação para os logs (padrão: símbolo)
+            
+        Returns:
+            Função fetch(*partes, force_refresh=False)
+        """
+        get_or_fetch = self._get_or_fetch
+        fetch_from_providers = self._fetch_from_providers
+        
+        def fetch(*parts: str, force_refresh: bool = False) -> Optional[Any]:
+            cache_key = key_format(*parts)
+            symbol = symbol_format(*parts) if symbol_format else parts[0]
+            return get_or_fetch(
+                cache_key,
+                lambda: fetch_from_providers(symbol, data_type, cache_key),
+                force_refresh=force_refresh,
+                label=label_format(*parts) if label_format else symbol
+            )
+        
+        return fetch
+    
+    def _get_or_fetch(self, cache_key: str, fetcher: Callable[[], Any],
+                      force_refresh: bool = False, label: str = "") -> Optional[Any]:
+        """
+        Consulta o cache e, se não encontrar, executa a busca
+        
+        Chamadas simultâneas para a mesma chave aguardam a busca que já está
+        em andamento em vez de repetir a requisição ao provider.
         
-        # Tentar cache primeiro
+        Args:
+            cache_key: Chave do cache
+            fetcher: Função que busca (e armazena) os dados
+            force_refresh: Forçar atualização ignorando cache
+            label: Identificação do ativo para os logs
+            
+        Returns:
+            Dados obtidos ou None se erro
+        """
+        # Tentar cache primeiro (se não forçar refresh)
         if not force_refresh:
             cached_data = self.cache_manager.get(cache_key)
             if cached_data:
-                self.stats['cache_hits'] += 1
-                logger.debug(f"Cache hit para {from_currency}/{to_currency}")
+                self._cnt_cache_hits.increment()
+                logger.debug("Cache hit para %s", label)
                 return cached_data
         
-        self.stats['cache_misses'] += 1
-        self.stats['requests'] += 1
+        with self.lock:
+            future = self._inflight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[cache_key] = future
         
-        # Buscar dados dos providers
-        data = self._fetch_from_providers(
-            symbol=f"{from_currency}{to_currency}=X",
-            data_type=DataType.CURRENCY,
-            sources=[DataSource.YAHOO_FINANCE, DataSource.EXCHANGE_RATE_API],
-            cache_key=cache_key
-        )
+        if not owner:
+            logger.debug("Aguardando busca em andamento para %s", label)
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                logger.warning(f"Timeout aguardando busca em andamento para {label}")
+                return None
         
-        return data
+        try:
+            # A busca anterior pode ter terminado depois da consulta acima; peek
+            # não conta outro miss nem mexe no LRU, e roda fora do self.lock
+            cached_data = None if force_refresh else self.cache_manager.peek(cache_key)
+            if cached_data:
+                self._cnt_cache_hits.increment()
+                data = cached_data
+            else:
+                self._cnt_cache_misses.increment()
+                self._cnt_requests.increment()
+                data = fetcher()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self.lock:
+                self._inflight.pop(cache_key, None)
     
     def get_fund_data(self, cnpj: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
         """
@@ -248,11 +446,79 @@ class DataManager:
             Dicionário com dados de preço por símbolo
         """
         results = {}
+        cache_keys = {symbol: _STOCK_PRICE_KEY(symbol) for symbol in symbols}
+        
+        # Uma única consulta ao cache separa os encontrados dos que faltam
+        if not force_refresh:
+            cached = self.cache_manager.get_many(list(cache_keys.values()))
+            for symbol, cache_key in cache_keys.items():
+                data = cached.get(cache_key)
+                if data:
+                    results[symbol] = data
+            self._cnt_cache_hits.add(len(results))
+        
+        misses = [symbol for symbol in cache_keys if symbol not in results]
+        if not misses:
+            return results
+        
+        self._cnt_cache_misses.add(len(misses))
+        self._cnt_requests.add(len(misses))
+        
+        # Os que faltam vão numa única requisição em lote
+        quotes, attempted = self._fetch_quotes_batch(misses)
+        if quotes:
+            import numpy as np
+            from ._kernels import compute_price_changes
+            
+            # Variações de todo o lote calculadas numa única chamada vetorizada
+            quoted = list(quotes)
+            n = len(quoted)
+            prices = np.fromiter((quotes[s][0] for s in quoted), dtype=np.float64, count=n)
+            previous = np.fromiter(
+                (np.nan if quotes[s][1] is None else quotes[s][1] for s in quoted),
+                dtype=np.float64, count=n
+            )
+            change, change_pct = compute_price_changes(prices, previous)
+            
+            fetched = {}
+            for i, symbol in enumerate(quoted):
+                fetched[cache_keys[symbol]] = results[symbol] = self._make_price(
+                    symbol, quotes[symbol][0], DataSource.YAHOO_FINANCE,
+                    change=None if np.isnan(change[i]) else float(change[i]),
+                    change_percent=None if np.isnan(change_pct[i]) else float(change_pct[i])
+                )
+            
+            # Todo o lote entra no cache numa única operação
+            self.cache_manager.set_many(
+                fetched,
+                data_type=DataType.STOCK,
+                expires_in=self._get_expiration_time(DataType.STOCK),
+                source=DataSource.YAHOO_FINANCE,
+                quality=DataQuality.GOOD
+            )
+            self._count_provider_requests(DataSource.YAHOO_FINANCE, n)
         
-        # Executar requisições em paralelo
+        # Os que o lote não resolveu são buscados por símbolo no executor, exceto
+        # os que o endpoint de cotação já recusou (seria a mesma requisição de
+        # novo): esses contam como falha e vão direto para o fallback
         futures = []
-        for symbol in symbols:
-            future = self.executor.submit(self.get_stock_price, symbol, force_refresh)
+        for symbol in misses:
+            if symbol in results:
+                continue
+            if symbol in attempted:
+                logger.error(f"Todos os providers falharam para {symbol}")
+                self._cnt_errors.increment()
+                data = None
+                if self.fallback_config['enabled']:
+                    data = self._try_fallback(symbol, DataType.STOCK, cache_keys[symbol])
+                if data:
+                    results[symbol] = data
+                else:
+                    logger.warning(f"Nenhum dado obtido para {symbol}")
+                continue
+            future = self.executor.submit(
+                self._fetch_from_providers, symbol, DataType.STOCK, cache_keys[symbol]
+            )
             futures.append((symbol, future))
         
         # Coletar resultados
@@ -268,54 +534,108 @@ class DataManager:
         
         return results
     
-    def _fetch_from_providers(self, symbol: str, data_type: DataType, 
-                             sources: List[DataSource], cache_key: str) -> Optional[Any]:
+    def get_multiple_stocks_soa(self, symbols: List[str],
+                                force_refresh: bool = False) -> PriceFrame:
+        """
+        Obtém preços de múltiplas ações em formato colunar
+        
+        Args:
+            symbols: Lista de símbolos
+            force_refresh: Forçar atualização ignorando cache
+            
+        Returns:
+            PriceFrame com os símbolos obtidos, na ordem de symbols
+        """
+        import numpy as np
+        
+        data = self.get_multiple_stocks(symbols, force_refresh)
+        obtained = [symbol for symbol in dict.fromkeys(symbols) if symbol in data]
+        n = len(obtained)
+        
+        frame = PriceFrame(
+            symbols=np.empty(n, dtype=object),
+            currencies=np.empty(n, dtype=object),
+            prices=np.empty(n, dtype=np.float64),
+            change_24h=np.empty(n, dtype=np.float64),
+            change_percent_24h=np.empty(n, dtype=np.float64),
+            timestamps=np.empty(n, dtype='datetime64[us]'),
+            quality=np.empty(n, dtype=np.int8)
+        )
+        
+        for i, symbol in enumerate(obtained):
+            item = data[symbol]
+            frame.symbols[i] = symbol
+            frame.currencies[i] = item.currency
+            frame.prices[i] = item.price
+            frame.change_24h[i] = np.nan if item.change_24h is None else item.change_24h
+            frame.change_percent_24h[i] = (
+                np.nan if item.change_percent_24h is None else item.change_percent_24h
+            )
+            frame.timestamps[i] = item.timestamp
+            frame.quality[i] = DATA_QUALITY_CODES[item.quality]
+        
+        return frame
+    
+    def _fetch_quotes_batch(self, symbols: List[str]) -> Tuple[Dict[str, Any], Set[str]]:
+        """
+        Busca cotações de vários símbolos de uma vez
+        
+        Primeiro um único yfinance.download para todo o lote; os símbolos que
+        ficarem de fora vão numa sessão aiohttp, se disponível.
+        
+        Returns:
+            Dicionário símbolo -> (preço, fechamento anterior) dos obtidos e os
+            símbolos já tentados no endpoint de cotação (que a busca por símbolo
+            não deve repetir)
+        """
+        from ..providers.yahoo_finance_provider import ASYNC_AVAILABLE
+        
+        provider = self.providers.get('yahoo_finance')
+        if provider is None:
+            return {}, set()
+        
+        quotes = provider.get_stock_prices(symbols, timeout=self.timeout)
+        remaining = [symbol for symbol in symbols if symbol not in quotes]
+        if not remaining or not ASYNC_AVAILABLE:
+            return quotes, set()
+        
+        # asyncio.run não pode ser chamado de dentro de um event loop (ex.: Jupyter)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            return quotes, set()
+        
+        try:
+            quotes.update(asyncio.run(provider.fetch_quotes_async(remaining, timeout=self.timeout)))
+        except Exception as e:
+            # Falha da sessão inteira: a busca por símbolo ainda tenta cada um
+            logger.warning(f"Erro na busca em lote de {len(remaining)} símbolos: {e}")
+            return quotes, set()
+        
+        return quotes, set(remaining)
+    
+    def _fetch_from_providers(self, symbol: str, data_type: DataType,
+                             cache_key: str) -> Optional[Any]:
         """
         Busca dados dos providers com fallback
         
         Args:
             symbol: Símbolo do ativo
             data_type: Tipo de dado
-            sources: Lista de fontes para tentar
             cache_key: Chave do cache
             
         Returns:
             Dados obtidos ou None se erro
         """
-        for source in sources:
+        for source, fetch_price in self._provider_chain.get(data_type, ()):
             try:
-                logger.debug(f"Tentando {source.value} para {symbol}")
-                
-                if source == DataSource.YAHOO_FINANCE and 'yahoo_finance' in self.providers:
-                    price = self.providers['yahoo_finance'].get_stock_price(symbol)
-                    if price:
-                        # Criar objeto PriceData
-                        from ..models.data_models import PriceData
-                        data = PriceData(
-                            symbol=symbol,
-                            price=price,
-                            currency="BRL" if ".SA" in symbol else "USD",
-                            source=source,
-                            quality=DataQuality.GOOD,
-                            timestamp=datetime.now()
-                        )
-                        
-                        # Armazenar no cache
-                        self.cache_manager.set(
-                            key=cache_key,
-                            data=data,
-                            data_type=data_type,
-                            expires_in=self._get_expiration_time(data_type),
-                            source=source,
-                            quality=DataQuality.GOOD
-                        )
-                        
-                        self.stats['provider_requests'][source.value] = \
-                            self.stats['provider_requests'].get(source.value, 0) + 1
-                        
-                        return data
+                logger.debug("Tentando %s para %s", source.value, symbol)
                 
-                # Adicionar outros providers aqui conforme implementados
+                price = fetch_price(symbol)
+                if price:
+                    return self._store_price(symbol, price, data_type, source, cache_key)
                 
             except Exception as e:
                 logger.warning(f"Erro com {source.value} para {symbol}: {e}")
@@ -323,7 +643,7 @@ class DataManager:
         
         # Se chegou aqui, nenhum provider funcionou
         logger.error(f"Todos os providers falharam para {symbol}")
-        self.stats['errors'] += 1
+        self._cnt_errors.increment()
         
         # Tentar fallback se habilitado
         if self.fallback_config['enabled']:
@@ -331,20 +651,47 @@ class DataManager:
         
         return None
     
+    def _make_price(self, symbol: str, price: float, source: DataSource,
+                    change: Optional[float] = None,
+                    change_percent: Optional[float] = None) -> PriceData:
+        """Cria o PriceData de um preço obtido de um provider"""
+        return PriceData(
+            symbol=symbol,
+            price=price,
+            currency=_infer_currency(symbol),
+            source=source,
+            quality=DataQuality.GOOD,
+            timestamp=_coarse_now(),
+            change_24h=change,
+            change_percent_24h=change_percent
+        )
+    
+    def _store_price(self, symbol: str, price: float, data_type: DataType,
+                     source: DataSource, cache_key: str) -> PriceData:
+        """Cria o PriceData de um preço obtido e o armazena no cache"""
+        data = self._make_price(symbol, price, source)
+        
+        # Armazenar no cache
+        self.cache_manager.set(
+            key=cache_key,
+            data=data,
+            data_type=data_type,
+            expires_in=self._get_expiration_time(data_type),
+            source=source,
+            quality=DataQuality.GOOD
+        )
+        
+        self._count_provider_requests(source)
+        
+        return data
+    
+    def _count_provider_requests(self, source: DataSource, n: int = 1) -> None:
+        """Contabiliza requisições atendidas por um provider"""
+        self._provider_requests[source.value] += n
+    
     def _get_expiration_time(self, data_type: DataType) -> int:
         """Retorna tempo de expiração para tipo de dado"""
-        expiration_config = self.config['cache']['expiration']
-        
-        if data_type == DataType.STOCK:
-            return expiration_config['stock']
-        elif data_type == DataType.CRYPTO:
-            return expiration_config['crypto']
-        elif data_type == DataType.CURRENCY:
-            return expiration_config['currency']
-        elif data_type == DataType.FUND:
-            return expiration_config['fund']
-        else:
-            return 300  # 5 minutos padrão
+        return self._expiration_by_type.get(data_type, 300)  # 5 minutos padrão
     
     def _try_fallback(self, symbol: str, data_type: DataType, cache_key: str) -> Optional[Any]:
         """Tenta fallback com dados simulados"""
@@ -352,7 +699,7 @@ class DataManager:
             return None
         
         logger.info(f"Usando dados simulados para {symbol}")
-        self.stats['fallbacks'] += 1
+        self._cnt_fallbacks.increment()
         
         # Criar dados simulados básicos
         if data_type == DataType.STOCK:
@@ -360,6 +707,7 @@ class DataManager:
                 symbol=symbol,
                 price=50.0,  # Preço simulado
                 currency="BRL",
+                timestamp=_coarse_now(),
                 source=DataSource.SIMULATED,
                 quality=DataQuality.POOR,
                 metadata={'simulated': True}
@@ -369,6 +717,7 @@ class DataManager:
                 symbol=symbol,
                 price=50000.0,  # Preço simulado
                 currency="USD",
+                timestamp=_coarse_now(),
                 source=DataSource.SIMULATED,
                 quality=DataQuality.POOR,
                 metadata={'simulated': True}
@@ -388,11 +737,34 @@ class DataManager:
         
         return simulated_data
     
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Fotografia dos contadores do Data Manager"""
+        with self._stats_lock:
+            return {
+                'requests': self._cnt_requests.value,
+                'cache_hits': self._cnt_cache_hits.value,
+                'cache_misses': self._cnt_cache_misses.value,
+                'provider_requests': dict(self._provider_requests),
+                'errors': self._cnt_errors.value,
+                'fallbacks': self._cnt_fallbacks.value
+            }
+    
     def get_stats(self) -> Dict[str, Any]:
-        """Retorna estatísticas do sistema"""
+        """
+        Retorna estatísticas do sistema
+        
+        O resultado é reaproveitado por até STATS_TTL segundos (ex.: scrapes
+        de monitoramento); o dicionário retornado não deve ser alterado.
+        """
+        now = time.monotonic()
+        computed_at, stats = self._stats_cache
+        if stats is not None and now - computed_at < STATS_TTL:
+            return stats
+        
         cache_stats = self.cache_manager.get_stats()
         
-        return {
+        stats = {
             'data_manager': self.stats,
             'cache': cache_stats,
             'providers': {
@@ -400,6 +772,8 @@ class DataManager:
             },
             'timestamp': datetime.now().isoformat()
         }
+        self._stats_cache = (now, stats)
+        return stats
     
     def clear_cache(self) -> None:
         """Limpa todo o cache"""
@@ -409,7 +783,9 @@ class DataManager:
     def shutdown(self) -> None:
         """Desliga o Data Manager"""
         logger.info("Desligando Data Manager...")
-        self.executor.shutdown(wait=True)
+        # O executor compartilhado é encerrado pelo atexit
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
         self.cache_manager.shutdown()
         logger.info("Data Manager desligado")
     
@@ -6,9 +6,46 @@ Modelos de Dados para Sistema de Obtenção de Dados Financeiros
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Union
 from enum import Enum
 import json
+import math
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+def _convert(data: Dict[str, Any], cls: type) -> Any:
+    """
+    Monta o dataclass com msgspec.convert (em C: datetimes ISO e enums incluídos)
+    
+    Retorna None sem msgspec ou se algum campo não tiver exatamente o tipo
+    declarado (ex.: numpy.float64); aí vale o from_dict manual.
+    """
+    if msgspec is None:
+        return None
+    try:
+        return msgspec.convert(data, cls)
+    except msgspec.ValidationError:
+        return None
+
+@lru_cache(maxsize=4096)
+def _parse_ts(value: str) -> datetime:
+    """
+    datetime.fromisoformat memoizado pela string
+    
+    Entradas gravadas juntas repetem o mesmo timestamp (o DataManager arredonda
+    o now() dos preços); datetime é imutável, então a instância pode ser compartilhada.
+    """
+    return datetime.fromisoformat(value)
 
 class DataType(Enum):
     """Tipos de dados financeiros"""
@@ -39,7 +76,13 @@ class DataQuality(Enum):
     POOR = "poor"               # Dados problemáticos
     UNKNOWN = "unknown"         # Qualidade não determinada
 
-@dataclass
+# Valor -> membro, para os from_dict não passarem por Enum.__call__; valores
+# desconhecidos de fonte/qualidade viram UNKNOWN
+_DATA_TYPES: Dict[str, DataType] = {member.value: member for member in DataType}
+_DATA_SOURCES: Dict[str, DataSource] = {member.value: member for member in DataSource}
+_DATA_QUALITIES: Dict[str, DataQuality] = {member.value: member for member in DataQuality}
+
+@dataclass(slots=True)
 class PriceData:
     """Dados de preço de um ativo"""
     symbol: str
@@ -81,13 +124,16 @@ class PriceData:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PriceData':
         """Cria instância a partir de dicionário"""
+        obj = _convert(data, cls)
+        if obj is not None:
+            return obj
         return cls(
             symbol=data['symbol'],
             price=data['price'],
             currency=data.get('currency', 'USD'),
-            timestamp=datetime.fromisoformat(data['timestamp']),
-            source=DataSource(data.get('source', 'unknown')),
-            quality=DataQuality(data.get('quality', 'unknown')),
+            timestamp=_parse_ts(data['timestamp']),
+            source=_DATA_SOURCES.get(data.get('source'), DataSource.UNKNOWN),
+            quality=_DATA_QUALITIES.get(data.get('quality'), DataQuality.UNKNOWN),
             change_24h=data.get('change_24h'),
             change_percent_24h=data.get('change_percent_24h'),
             volume=data.get('volume'),
@@ -97,7 +143,7 @@ class PriceData:
             metadata=data.get('metadata', {})
         )
 
-@dataclass
+@dataclass(slots=True)
 class ExchangeRate:
     """Dados de câmbio"""
     from_currency: str
@@ -125,19 +171,102 @@ class ExchangeRate:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ExchangeRate':
         """Cria instância a partir de dicionário"""
+        obj = _convert(data, cls)
+        if obj is not None:
+            return obj
         return cls(
             from_currency=data['from_currency'],
             to_currency=data['to_currency'],
             rate=data['rate'],
-            timestamp=datetime.fromisoformat(data['timestamp']),
-            source=DataSource(data.get('source', 'unknown')),
-            quality=DataQuality(data.get('quality', 'unknown')),
+            timestamp=_parse_ts(data['timestamp']),
+            source=_DATA_SOURCES.get(data.get('source'), DataSource.UNKNOWN),
+            quality=_DATA_QUALITIES.get(data.get('quality'), DataQuality.UNKNOWN),
             metadata=data.get('metadata', {})
         )
 
-@dataclass
+# Códigos int8 da qualidade usados nas colunas do PriceFrame
+DATA_QUALITY_ORDER: List[DataQuality] = list(DataQuality)
+DATA_QUALITY_CODES: Dict[DataQuality, int] = {q: i for i, q in enumerate(DATA_QUALITY_ORDER)}
+
+@dataclass(slots=True)
+class PriceFrame:
+    """
+    Preços de vários ativos em colunas numpy (uma posição por ativo)
+    
+    Evita um objeto por ativo para quem vai processar os preços de forma
+    vetorizada. Valores ausentes de variação são NaN.
+    """
+    symbols: Any             # np.ndarray[object]
+    currencies: Any          # np.ndarray[object]
+    prices: Any              # np.ndarray[float64]
+    change_24h: Any          # np.ndarray[float64]
+    change_percent_24h: Any  # np.ndarray[float64]
+    timestamps: Any          # np.ndarray[datetime64[us]]
+    quality: Any             # np.ndarray[int8], índice em DATA_QUALITY_ORDER
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para dicionário coluna -> array (sem copiar os arrays)"""
+        return {
+            'symbols': self.symbols,
+            'currencies': self.currencies,
+            'prices': self.prices,
+            'change_24h': self.change_24h,
+            'change_percent_24h': self.change_percent_24h,
+            'timestamps': self.timestamps,
+            'quality': self.quality
+        }
+
+# Colunas de preço que HistoricalData.columns(compact=True) guarda em float32
+PRICE_COLUMNS = frozenset({'open', 'high', 'low', 'close', 'adj close', 'adj_close'})
+
+def _column(values: Any, name: str = '', compact: bool = False) -> Any:
+    """
+    Converte os valores de uma coluna em np.ndarray
+    
+    Números viram float64 (None -> NaN), ou float32 para os preços
+    (PRICE_COLUMNS) com compact; datas e strings ISO viram datetime64[us];
+    o resto fica como object.
+    """
+    import numpy as np
+    
+    number = 'float32' if compact and name.lower() in PRICE_COLUMNS else 'float64'
+    column = np.asarray(values)
+    if number == 'float32' and column.dtype.kind in 'iuf':
+        return column.astype(np.float32)
+    if column.dtype != object and column.dtype.kind not in 'US':
+        return column
+    for dtype in (number, 'datetime64[us]'):
+        try:
+            return np.asarray(values, dtype=dtype)
+        except (ValueError, TypeError):
+            pass
+    return np.asarray(values, dtype=object)
+
+def _column_to_list(column: Any) -> List[Any]:
+    """Coluna numpy -> lista serializável (datas como strings ISO)"""
+    import numpy as np
+    
+    if column.dtype.kind == 'M':
+        return np.datetime_as_string(column, unit='us').tolist()
+    return column.tolist()
+
+@dataclass(slots=True)
 class HistoricalData:
-    """Dados históricos de um ativo"""
+    """
+    Dados históricos de um ativo
+    
+    data continua sendo a lista de barras OHLCV (dicionários); columns() dá a
+    visão em colunas numpy (coluna -> array, uma posição por barra), como no
+    PriceFrame, para quem vai processar a série de forma vetorizada.
+    
+    Quantização: só com columns(compact=True), open/high/low/close viram
+    float32 (~7 dígitos significativos, resolução abaixo de um centavo até
+    ~R$ 167 mil), metade da memória. Por padrão as colunas numéricas ficam em
+    int64/float64, sem perda em relação à fonte; data nunca é alterada.
+    """
     symbol: str
     data_type: DataType
     data: List[Dict[str, Any]]  # Lista de dados OHLCV
@@ -150,6 +279,50 @@ class HistoricalData:
     # Metadados
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    def __len__(self) -> int:
+        return len(self.data)
+    
+    @staticmethod
+    def columns_from_records(records: List[Dict[str, Any]], compact: bool = False) -> Dict[str, Any]:
+        """Converte uma lista de barras (dicionários) em colunas numpy"""
+        names = dict.fromkeys(name for record in records for name in record)
+        return {
+            name: _column([record.get(name) for record in records], name, compact)
+            for name in names
+        }
+    
+    @staticmethod
+    def records_from_columns(columns: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Converte colunas (arrays ou listas) em lista de barras (datas como strings ISO)"""
+        lists = {
+            name: _column_to_list(column) if hasattr(column, 'dtype') else list(column)
+            for name, column in columns.items()
+        }
+        return [dict(zip(lists, values)) for values in zip(*lists.values())]
+    
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], **kwargs) -> 'HistoricalData':
+        """Cria instância a partir de uma lista de barras OHLCV"""
+        return cls(data=list(records), **kwargs)
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any], **kwargs) -> 'HistoricalData':
+        """Cria instância a partir de colunas (ex.: o resultado de columns())"""
+        return cls(data=cls.records_from_columns(columns), **kwargs)
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """Barras como lista de dicionários"""
+        return self.data
+    
+    def columns(self, compact: bool = False) -> Dict[str, Any]:
+        """
+        Barras em colunas numpy, calculadas a cada chamada a partir de data
+        
+        Args:
+            compact: Preços em float32 em vez de float64 (ver quantização acima)
+        """
+        return self.columns_from_records(self.data, compact)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário"""
         return {
@@ -167,19 +340,24 @@ class HistoricalData:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'HistoricalData':
         """Cria instância a partir de dicionário"""
+        # Aceita também o formato em colunas (coluna -> lista de valores)
+        records = data['data']
+        if isinstance(records, dict):
+            records = cls.records_from_columns(records)
+        
         return cls(
             symbol=data['symbol'],
-            data_type=DataType(data['data_type']),
-            data=data['data'],
-            start_date=datetime.fromisoformat(data['start_date']),
-            end_date=datetime.fromisoformat(data['end_date']),
+            data_type=_DATA_TYPES[data['data_type']],
+            data=records,
+            start_date=_parse_ts(data['start_date']),
+            end_date=_parse_ts(data['end_date']),
             interval=data.get('interval', '1d'),
-            source=DataSource(data.get('source', 'unknown')),
-            quality=DataQuality(data.get('quality', 'unknown')),
+            source=_DATA_SOURCES.get(data.get('source'), DataSource.UNKNOWN),
+            quality=_DATA_QUALITIES.get(data.get('quality'), DataQuality.UNKNOWN),
             metadata=data.get('metadata', {})
         )
 
-@dataclass
+@dataclass(slots=True)
 class CacheEntry:
     """Entrada do cache"""
     key: str
@@ -195,11 +373,18 @@ class CacheEntry:
     last_accessed: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
     
-    def is_expired(self) -> bool:
-        """Verifica se o cache expirou"""
-        if self.expires_at is None:
-            return False
-        return datetime.now() > self.expires_at
+    # Expiração no relógio monotônico, derivada de expires_at e nunca serializada:
+    # a verificação vira uma comparação de floats, sem criar um datetime a cada consulta
+    expires_at_mono: float = field(default=math.inf, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.expires_at is not None:
+            remaining = (self.expires_at - datetime.now()).total_seconds()
+            self.expires_at_mono = time.monotonic() + remaining
+    
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Verifica se o cache expirou (now: valor de time.monotonic() já obtido)"""
+        return self.expires_at_mono <= (time.monotonic() if now is None else now)
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário"""
@@ -219,20 +404,23 @@ class CacheEntry:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CacheEntry':
         """Cria instância a partir de dicionário"""
+        obj = _convert(data, cls)
+        if obj is not None:
+            return obj
         return cls(
             key=data['key'],
             data=data['data'],
-            data_type=DataType(data['data_type']),
-            timestamp=datetime.fromisoformat(data['timestamp']),
-            expires_at=datetime.fromisoformat(data['expires_at']) if data.get('expires_at') else None,
-            source=DataSource(data.get('source', 'unknown')),
-            quality=DataQuality(data.get('quality', 'unknown')),
+            data_type=_DATA_TYPES[data['data_type']],
+            timestamp=_parse_ts(data['timestamp']),
+            expires_at=_parse_ts(data['expires_at']) if data.get('expires_at') else None,
+            source=_DATA_SOURCES.get(data.get('source'), DataSource.UNKNOWN),
+            quality=_DATA_QUALITIES.get(data.get('quality'), DataQuality.UNKNOWN),
             access_count=data.get('access_count', 0),
-            last_accessed=datetime.fromisoformat(data['last_accessed']),
+            last_accessed=_parse_ts(data['last_accessed']),
             metadata=data.get('metadata', {})
         )
 
-@dataclass
+@dataclass(slots=True)
 class DataRequest:
     """Requisição de dados"""
     symbol: str
@@ -262,15 +450,15 @@ class DataRequest:
         """Cria instância a partir de dicionário"""
         return cls(
             symbol=data['symbol'],
-            data_type=DataType(data['data_type']),
-            sources=[DataSource(source) for source in data.get('sources', [])],
+            data_type=_DATA_TYPES[data['data_type']],
+            sources=[_DATA_SOURCES[source] for source in data.get('sources', [])],
             force_refresh=data.get('force_refresh', False),
             timeout=data.get('timeout', 30),
             retry_count=data.get('retry_count', 3),
             metadata=data.get('metadata', {})
         )
 
-@dataclass
+@dataclass(slots=True)
 class DataResponse:
     """Resposta de dados"""
     request: DataRequest
@@ -307,18 +495,27 @@ class DataResponse:
             data=data.get('data'),
             success=data.get('success', False),
             error_message=data.get('error_message'),
-            source_used=DataSource(data['source_used']) if data.get('source_used') else None,
-            quality=DataQuality(data.get('quality', 'unknown')),
+            source_used=_DATA_SOURCES[data['source_used']] if data.get('source_used') else None,
+            quality=_DATA_QUALITIES.get(data.get('quality'), DataQuality.UNKNOWN),
             response_time=data.get('response_time'),
-            timestamp=datetime.fromisoformat(data['timestamp']),
+            timestamp=_parse_ts(data['timestamp']),
             metadata=data.get('metadata', {})
         )
 
 # Funções utilitárias
 def serialize_dataclass(obj: Any) -> str:
-    """Serializa um dataclass para JSON"""
+    """
+    Serializa um dataclass para JSON
+    
+    Sempre a partir do to_dict, para a saída ser a mesma com ou sem orjson
+    (campos internos, como o expires_at_mono do CacheEntry, ficam de fora).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj.to_dict(), default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
     return json.dumps(obj.to_dict(), default=str, ensure_ascii=False)
 
-def deserialize_dataclass(data: str, cls: type) -> Any:
+def deserialize_dataclass(data: Union[str, bytes], cls: type) -> Any:
     """Deserializa JSON para dataclass"""
+    if orjson is not None:
+        return cls.from_dict(orjson.loads(data))
     return cls.from_dict(json.loads(data)) 
\ No newline at end of file
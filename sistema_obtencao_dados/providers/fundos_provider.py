@@ -8,12 +8,38 @@ Integra com Cache Manager e usa dados processados da CVM + scraping Mais Retorno
 import sys
 import os
 import time
+import asyncio
 import logging
 import json
-import requests
+import pickle
+import random
+import string
+import threading
+from collections import deque
+from functools import cached_property, lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
-import pandas as pd
+from typing import Dict, List, Optional, Any, Tuple, Union
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Sem aiohttp, get_multiple_fundos busca um fundo por vez
+ASYNC_AVAILABLE = aiohttp is not None
+
+MAIS_RETORNO_URL = 'https://maisretorno.com'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
 # Adicionar diretórios ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -24,37 +50,236 @@ from ..models.data_models import DataType, DataSource, DataQuality
 
 logger = logging.getLogger(__name__)
 
+MAPEAMENTO_PATH = os.path.join(os.path.dirname(__file__), '../../mapeamento_fundos.json')
+
+# Versão do formato do arquivo .cache.pkl ao lado do JSON (mudou -> é refeito)
+MAPEAMENTO_CACHE_VERSION = 2
+
+# Remove a pontuação de um CNPJ formatado (04.305.193/0001-40 -> 04305193000140)
+_CNPJ_PUNCTUATION = str.maketrans('', '', string.punctuation + ' ')
+
+
+def _cnpj_digits(cnpj: str) -> str:
+    return cnpj.translate(_CNPJ_PUNCTUATION)
+
+
+@lru_cache(maxsize=8192)
+def _fundo_cache_key(cnpj: str) -> str:
+    """
+    Chave do cache de um fundo, pelo CNPJ só com dígitos
+    
+    Formatos diferentes do mesmo CNPJ dividem a entrada; a string é criada uma
+    vez e internada, e a busca no dicionário do cache acerta pela identidade.
+    """
+    return sys.intern(f"fundo_data_{_cnpj_digits(cnpj)}")
+
+
+MESES = ('Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+         'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez')
+
+
+def _parse_slug_busca(html: bytes) -> Optional[str]:
+    """Slug do primeiro link para /fundo/ na página de busca (None sem selectolax)"""
+    if HTMLParser is None:
+        return None
+    for link in HTMLParser(html).css('a[href*="/fundo/"]'):
+        href = link.attributes.get('href') or ''
+        slug = href.split('/fundo/')[-1].split('?')[0].split('#')[0]
+        if slug:
+            return slug
+    return None
+
+
+def _parse_rentabilidade(valor: str) -> Optional[float]:
+    """Converte '1,23%' em 0.0123"""
+    try:
+        return float(valor.replace('%', '').strip().replace(',', '.')) / 100
+    except ValueError:
+        return None
+
+
+def _parse_rentabilidades(tree) -> Dict[str, Dict[str, float]]:
+    """Rentabilidades mensais por ano da primeira tabela com os meses"""
+    rentabilidades = {}
+    for tabela in tree.css('table'):
+        texto = tabela.text()
+        if 'Jan' not in texto or 'Fev' not in texto or 'Mar' not in texto:
+            continue
+        
+        for linha in tabela.css('tr'):
+            celulas = [celula.text(strip=True) for celula in linha.css('td, th')]
+            # Ano + 12 meses
+            if len(celulas) < 13 or not (celulas[0].isdigit() and len(celulas[0]) == 4):
+                continue
+            meses = {}
+            for mes, valor in zip(MESES, celulas[1:]):
+                rentabilidade = _parse_rentabilidade(valor)
+                if rentabilidade is not None:
+                    meses[mes] = rentabilidade
+            rentabilidades[celulas[0]] = meses
+        break
+    return rentabilidades
+
+
+def _retry_wait(attempt: int, retry_after: Optional[str]) -> float:
+    """Espera antes de repetir após um 429: Retry-After se vier em segundos, senão backoff com jitter"""
+    if retry_after and retry_after.isdigit():
+        return min(60, int(retry_after))
+    return min(60, 2 ** attempt + random.random())
+
+
+def _build_indexes(fundos: Dict[str, Dict[str, str]]) -> Tuple[Dict[str, Dict[str, str]], Dict[str, List[Dict[str, str]]]]:
+    """Monta os índices CNPJ (só dígitos) -> fundo e categoria (casefold) -> fundos"""
+    by_digits: Dict[str, Dict[str, str]] = {}
+    todos: List[Dict[str, str]] = []
+    # '' guarda todos os fundos, na ordem do mapeamento
+    by_category: Dict[str, List[Dict[str, str]]] = {'': todos}
+    # Um único translate por CNPJ e métodos resolvidos fora do laço
+    punctuation = _CNPJ_PUNCTUATION
+    add_todos = todos.append
+    for cnpj, dados in fundos.items():
+        by_digits[cnpj.translate(punctuation)] = dados
+        get = dados.get
+        categoria = get('categoria', '')
+        fundo = {
+            'cnpj': cnpj,
+            'nome': get('nome', ''),
+            'categoria': categoria,
+            'slug': get('slug', '')
+        }
+        add_todos(fundo)
+        if categoria:
+            key = categoria.casefold()
+            lista = by_category.get(key)
+            if lista is None:
+                by_category[key] = [fundo]
+            else:
+                lista.append(fundo)
+    return by_digits, by_category
+
+
+def _build_mapping_indexes(path: str) -> Tuple[Dict, Dict[str, Dict], Dict[str, List[Dict]]]:
+    """Interpreta o JSON do mapeamento e monta os índices por CNPJ e por categoria"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    mapeamento = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    
+    by_digits, by_category = _build_indexes(mapeamento.get('mapeamento_fundos', {}))
+    return mapeamento, by_digits, by_category
+
+
+@lru_cache(maxsize=4)
+def _load_mapping(path: str, mtime_ns: int) -> Tuple[Dict, Dict[str, Dict], Dict[str, List[Dict]]]:
+    """
+    Lê o mapeamento uma vez por processo; a mtime na chave descarta a versão antiga
+    
+    Retorna o mapeamento, o índice CNPJ (só dígitos) -> registro do fundo e o
+    índice categoria -> fundos. São compartilhados por todas as instâncias e
+    não devem ser alterados.
+    
+    Entre processos, os índices prontos ficam em <json>.cache.pkl, válido
+    enquanto a mtime do JSON for a mesma gravada nele.
+    """
+    cache_path = path + '.cache.pkl'
+    try:
+        with open(cache_path, 'rb') as f:
+            version, cached_mtime_ns, indexes = pickle.load(f)
+        if version == MAPEAMENTO_CACHE_VERSION and cached_mtime_ns == mtime_ns:
+            return indexes
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug("Cache do mapeamento inválido (%s): %s", cache_path, e)
+    
+    indexes = _build_mapping_indexes(path)
+    try:
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((MAPEAMENTO_CACHE_VERSION, mtime_ns, indexes), f, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("Não foi possível gravar o cache do mapeamento: %s", e)
+    return indexes
+
 class FundosProvider:
     """
     Provider para fundos de investimento com cache integrado
     """
     
-    def __init__(self, cache_manager: CacheManager, delay_between_requests: float = 2.0):
+    def __init__(self, cache_manager: CacheManager, delay_between_requests: float = 2.0,
+                 requests_per_window: int = 1, max_retries: int = 3):
         """
         Inicializa o provider de fundos
         
         Args:
             cache_manager: Instância do Cache Manager
-            delay_between_requests: Delay em segundos entre requisições
+            delay_between_requests: Janela em segundos do limite de requisições
+            requests_per_window: Requisições HTTP permitidas por janela
+            max_retries: Tentativas extras após erro 5xx ou rate limit (429)
         """
         self.cache_manager = cache_manager
         self.delay = delay_between_requests
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.max_retries = max_retries
+        # Horários (monotônicos) das últimas requisições: só quem vai à rede espera
+        self._bucket = deque(maxlen=requests_per_window)
+        self._bucket_lock = threading.Lock()
         
         # Carregar mapeamento de fundos
         self.mapeamento_fundos = self._carregar_mapeamento()
         
         logger.info(f"Fundos Provider inicializado com delay de {self.delay}s")
     
+    @cached_property
+    def session(self):
+        """Sessão HTTP, criada (e o requests importado) só na primeira requisição"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        try:
+            import requests_cache
+        except ImportError:
+            requests_cache = None
+        
+        if requests_cache is not None:
+            # Guarda as páginas com ETag/Last-Modified e revalida a cada requisição:
+            # quando o dado do fundo expira no cache, um 304 dispensa baixar o HTML
+            session = requests_cache.CachedSession(
+                os.path.join(self.cache_manager.persistent_cache_dir, 'http_fundos'),
+                backend='sqlite',
+                expire_after=requests_cache.EXPIRE_IMMEDIATELY,
+                allowable_methods=('GET',)
+            )
+        else:
+            session = requests.Session()
+        session.headers.update({
+            'User-Agent': USER_AGENT
+        })
+        # Erros 5xx são repetidos pelo urllib3 na mesma conexão; o 429 fica com
+        # _extrair_dados_fundo, que respeita o Retry-After e o limite de requisições.
+        # Tudo vai para um único host: o pool guarda até 32 conexões keep-alive para
+        # as chamadas vindas de várias threads. O Accept-Encoding padrão do requests
+        # já pede gzip/deflate (e br quando o brotli está instalado).
+        session.mount('https://', HTTPAdapter(
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=self.max_retries,
+                backoff_factor=1,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=('GET',),
+                raise_on_status=False
+            )
+        ))
+        return session
+    
     def _carregar_mapeamento(self) -> Dict:
-        """Carrega o mapeamento de fundos"""
+        """Carrega o mapeamento de fundos e os índices em self._by_digits e self._by_category"""
+        self._by_digits = {}
+        self._by_category = {'': []}
         try:
-            mapeamento_path = os.path.join(os.path.dirname(__file__), '../../mapeamento_fundos.json')
-            with open(mapeamento_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            mapeamento, self._by_digits, self._by_category = _load_mapping(
+                MAPEAMENTO_PATH, os.stat(MAPEAMENTO_PATH).st_mtime_ns
+            )
+            return mapeamento
         except FileNotFoundError:
             logger.warning("Arquivo de mapeamento de fundos não encontrado")
             return {'mapeamento_fundos': {}}
@@ -62,6 +287,37 @@ class FundosProvider:
             logger.error(f"Erro ao carregar mapeamento: {e}")
             return {'mapeamento_fundos': {}}
     
+    def _reservar_vaga(self) -> float:
+        """
+        Reserva a próxima vaga na janela de requisições
+        
+        Retorna quantos segundos esperar até ela. A reserva é feita sob o lock,
+        mas a espera não: threads e o event loop dividem o mesmo limite.
+        """
+        with self._bucket_lock:
+            now = time.monotonic()
+            slot = now
+            if len(self._bucket) == self._bucket.maxlen:
+                slot = max(now, self._bucket[0] + self.delay)
+            self._bucket.append(slot)
+        
+        wait = slot - now
+        if wait > 0:
+            logger.debug(f"Aguardando {wait:.2f} segundos...")
+        return wait
+    
+    def _throttle(self):
+        """Espera até haver vaga na janela de requisições"""
+        wait = self._reservar_vaga()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def _throttle_async(self):
+        """Versão assíncrona de _throttle, sem bloquear o event loop"""
+        wait = self._reservar_vaga()
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
     def buscar_slug_fundo(self, cnpj: str) -> Optional[str]:
         """
         Busca o slug de um fundo pelo CNPJ
@@ -73,15 +329,21 @@ class FundosProvider:
             Slug do fundo ou None se não encontrado
         """
         # Formatar CNPJ
-        cnpj_limpo = ''.join(filter(str.isdigit, cnpj))
+        cnpj_limpo = _cnpj_digits(cnpj)
         
         # Verificar no mapeamento
-        if cnpj_limpo in self.mapeamento_fundos.get('mapeamento_fundos', {}):
-            return self.mapeamento_fundos['mapeamento_fundos'][cnpj_limpo]['slug']
+        slug = self._slug_do_mapeamento(cnpj_limpo)
+        if slug:
+            return slug
         
         # Buscar no Mais Retorno (fallback)
         return self._buscar_slug_mais_retorno(cnpj_limpo)
     
+    def _slug_do_mapeamento(self, cnpj_limpo: str) -> Optional[str]:
+        """Slug do fundo no mapeamento local, sem acessar a rede"""
+        dados = self._by_digits.get(cnpj_limpo)
+        return dados['slug'] if dados else None
+    
     def _buscar_slug_mais_retorno(self, cnpj: str) -> Optional[str]:
         """
         Busca slug no Mais Retorno via web scraping
@@ -94,15 +356,14 @@ class FundosProvider:
         """
         try:
             # URL de busca do Mais Retorno
-            url = f"https://maisretorno.com/busca?q={cnpj}"
+            url = f"{MAIS_RETORNO_URL}/busca?q={cnpj}"
             
+            self._throttle()
             response = self.session.get(url, timeout=15)
             
             if response.status_code == 200:
-                # Implementar parsing do HTML para extrair slug
-                # Por enquanto, retorna None
                 logger.info(f"Busca no Mais Retorno para CNPJ {cnpj}")
-                return None
+                return _parse_slug_busca(response.content)
             
             return None
             
@@ -121,7 +382,7 @@ class FundosProvider:
         Returns:
             Dados do fundo ou None se erro
         """
-        cache_key = f"fundo_data_{cnpj}"
+        cache_key = _fundo_cache_key(cnpj)
         
         # Tentar cache primeiro
         if use_cache:
@@ -131,6 +392,16 @@ class FundosProvider:
                 return cached_data
         
         # Buscar dados reais
+        dados_fundo = self._buscar_fundo(cnpj)
+        
+        # Armazenar no cache
+        if dados_fundo and use_cache:
+            self._armazenar_fundo(cache_key, dados_fundo)
+        
+        return dados_fundo
+    
+    def _buscar_fundo(self, cnpj: str) -> Optional[Dict[str, Any]]:
+        """Busca os dados de um fundo no Mais Retorno, sem passar pelo cache"""
         try:
             logger.info(f"Buscando dados do fundo {cnpj}...")
             
@@ -141,29 +412,81 @@ class FundosProvider:
                 return None
             
             # Extrair dados do fundo
-            dados_fundo = self._extrair_dados_fundo(slug, cnpj)
-            
-            if dados_fundo:
-                # Armazenar no cache
-                if use_cache:
-                    self.cache_manager.set(
-                        key=cache_key,
-                        data=dados_fundo,
-                        data_type=DataType.FUND,
-                        expires_in=3600,  # 1 hora
-                        source=DataSource.UNKNOWN,
-                        quality=DataQuality.GOOD
-                    )
-                    logger.debug(f"Dados do fundo {cnpj} armazenados no cache")
-                
-                return dados_fundo
-            
-            return None
+            return self._extrair_dados_fundo(slug, cnpj)
             
         except Exception as e:
             logger.error(f"Erro ao buscar dados do fundo {cnpj}: {e}")
             return None
     
+    def _armazenar_fundo(self, cache_key: str, dados_fundo: Dict[str, Any]):
+        """Armazena os dados de um fundo no cache"""
+        self.cache_manager.set(
+            key=cache_key,
+            data=dados_fundo,
+            data_type=DataType.FUND,
+            expires_in=3600,  # 1 hora
+            source=DataSource.UNKNOWN,
+            quality=DataQuality.GOOD
+        )
+    
+    def _fundos_em_cache(self, cnpjs: List[str]) -> Dict[str, Any]:
+        """Dados já em cache dos CNPJs, numa única consulta ao cache"""
+        chaves = {_fundo_cache_key(cnpj): cnpj for cnpj in cnpjs}
+        encontrados = self.cache_manager.get_many(list(chaves))
+        return {chaves[chave]: dados for chave, dados in encontrados.items() if dados}
+    
+    def _armazenar_fundos(self, fundos: Dict[str, Any]):
+        """Armazena os dados de vários fundos no cache de uma só vez"""
+        if not fundos:
+            return
+        self.cache_manager.set_many(
+            {_fundo_cache_key(cnpj): dados for cnpj, dados in fundos.items()},
+            data_type=DataType.FUND,
+            expires_in=3600,  # 1 hora
+            source=DataSource.UNKNOWN,
+            quality=DataQuality.GOOD
+        )
+        logger.debug(f"{len(fundos)} fundos armazenados no cache")
+    
+    @staticmethod
+    def _resultados_em_ordem(cnpjs: List[str], fundos: Dict[str, Any]) -> Dict[str, Any]:
+        """Resultados na ordem dos CNPJs pedidos, registrando os que falharam"""
+        results = {}
+        for cnpj in cnpjs:
+            dados_fundo = fundos.get(cnpj)
+            if dados_fundo:
+                results[cnpj] = dados_fundo
+                logger.info(f"✅ {cnpj}: Dados obtidos")
+            else:
+                logger.warning(f"❌ {cnpj}: Erro ao obter dados")
+        return results
+    
+    def _montar_dados_fundo(self, slug: str, cnpj: str, html: bytes) -> Dict[str, Any]:
+        """Monta o dicionário de dados a partir da página do fundo"""
+        nome = f"Fundo {slug}"
+        rentabilidades = {}
+        # Sem selectolax, ficam só os dados básicos
+        if HTMLParser is not None:
+            tree = HTMLParser(html)
+            titulo = tree.css_first('h1')
+            if titulo is not None and titulo.text(strip=True):
+                nome = titulo.text(strip=True)
+            rentabilidades = _parse_rentabilidades(tree)
+        
+        return {
+            'cnpj': cnpj,
+            'slug': slug,
+            'nome': nome,
+            'timestamp': datetime.now().isoformat(),
+            'source': 'mais_retorno',
+            'rentabilidades': rentabilidades,
+            'dados_basicos': {
+                'tipo': 'Fundo de Investimento',
+                'categoria': 'Não especificada',
+                'administrador': 'Não especificado'
+            }
+        }
+    
     def _extrair_dados_fundo(self, slug: str, cnpj: str) -> Optional[Dict[str, Any]]:
         """
         Extrai dados de um fundo do Mais Retorno
@@ -177,69 +500,159 @@ class FundosProvider:
         """
         try:
             # URL do fundo no Mais Retorno
-            url = f"https://maisretorno.com/fundos/{slug}"
-            
-            response = self.session.get(url, timeout=15)
+            url = f"{MAIS_RETORNO_URL}/fundos/{slug}"
             
-            if response.status_code == 200:
-                # Implementar parsing do HTML para extrair dados
-                # Por enquanto, retorna dados básicos
-                dados_fundo = {
-                    'cnpj': cnpj,
-                    'slug': slug,
-                    'nome': f"Fundo {slug}",
-                    'timestamp': datetime.now().isoformat(),
-                    'source': 'mais_retorno',
-                    'rentabilidades': {},
-                    'dados_basicos': {
-                        'tipo': 'Fundo de Investimento',
-                        'categoria': 'Não especificada',
-                        'administrador': 'Não especificado'
-                    }
-                }
+            for attempt in range(self.max_retries + 1):
+                self._throttle()
+                response = self.session.get(url, timeout=15)
                 
-                return dados_fundo
+                if response.status_code == 200:
+                    return self._montar_dados_fundo(slug, cnpj, response.content)
+                if response.status_code != 429 or attempt == self.max_retries:
+                    return None
+                
+                wait = _retry_wait(attempt, response.headers.get('Retry-After'))
+                logger.warning(f"Rate limit atingido para fundo {slug}. Aguardando {wait:.1f} segundos...")
+                time.sleep(wait)
             
-            elif response.status_code == 429:
-                logger.warning(f"Rate limit atingido para fundo {slug}. Aguardando 10 segundos...")
-                time.sleep(10)
-                return self._extrair_dados_fundo(slug, cnpj)  # Retry
+            return None
+            
+        except Exception as e:
+            logger.error(f"Erro ao extrair dados do fundo {slug}: {e}")
+            return None
+    
+    async def _buscar_slug_mais_retorno_async(self, session, cnpj: str) -> Optional[str]:
+        """Versão assíncrona de _buscar_slug_mais_retorno"""
+        try:
+            url = f"{MAIS_RETORNO_URL}/busca?q={cnpj}"
+            
+            await self._throttle_async()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    logger.info(f"Busca no Mais Retorno para CNPJ {cnpj}")
+                    return _parse_slug_busca(await response.read())
+            
+            return None
+            
+        except Exception as e:
+            logger.error(f"Erro ao buscar slug no Mais Retorno: {e}")
+            return None
+    
+    async def _extrair_dados_fundo_async(self, session, slug: str, cnpj: str) -> Optional[Dict[str, Any]]:
+        """Versão assíncrona de _extrair_dados_fundo"""
+        url = f"{MAIS_RETORNO_URL}/fundos/{slug}"
+        
+        try:
+            for attempt in range(self.max_retries + 1):
+                await self._throttle_async()
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return self._montar_dados_fundo(slug, cnpj, await response.read())
+                    if response.status != 429 or attempt == self.max_retries:
+                        return None
+                    retry_after = response.headers.get('Retry-After')
                 
+                wait = _retry_wait(attempt, retry_after)
+                logger.warning(f"Rate limit atingido para fundo {slug}. Aguardando {wait:.1f} segundos...")
+                await asyncio.sleep(wait)
+            
             return None
             
         except Exception as e:
             logger.error(f"Erro ao extrair dados do fundo {slug}: {e}")
             return None
     
-    def get_multiple_fundos(self, cnpjs: List[str], use_cache: bool = True) -> Dict[str, Any]:
+    async def _fetch(self, session, semaphore: asyncio.Semaphore, cnpj: str) -> Optional[Dict[str, Any]]:
+        """Busca um fundo com no máximo N requisições simultâneas"""
+        async with semaphore:
+            cnpj_limpo = _cnpj_digits(cnpj)
+            slug = (self._slug_do_mapeamento(cnpj_limpo)
+                    or await self._buscar_slug_mais_retorno_async(session, cnpj_limpo))
+            if not slug:
+                logger.warning(f"Slug não encontrado para CNPJ {cnpj}")
+                return None
+            
+            return await self._extrair_dados_fundo_async(session, slug, cnpj)
+    
+    async def get_multiple_fundos_async(self, cnpjs: List[str], use_cache: bool = True,
+                                        concurrency: int = 8, timeout: float = 15) -> Dict[str, Any]:
         """
-        Obtém dados de múltiplos fundos
+        Obtém dados de múltiplos fundos em paralelo numa única sessão aiohttp
         
         Args:
             cnpjs: Lista de CNPJs
             use_cache: Se deve usar cache
+            concurrency: Máximo de requisições simultâneas ao Mais Retorno (o
+                limite de delay_between_requests continua valendo)
+            timeout: Timeout total de cada requisição em segundos
             
         Returns:
             Dicionário com dados dos fundos
         """
-        results = {}
+        if aiohttp is None:
+            raise RuntimeError("aiohttp não está instalado")
+        
+        fundos = self._fundos_em_cache(cnpjs) if use_cache else {}
+        pendentes = [c for c in dict.fromkeys(cnpjs) if c not in fundos]
+        
+        if pendentes:
+            semaphore = asyncio.Semaphore(concurrency)
+            async with aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=concurrency),
+                headers={'User-Agent': USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as session:
+                dados = await asyncio.gather(*(self._fetch(session, semaphore, c) for c in pendentes))
+            
+            novos = {cnpj: d for cnpj, d in zip(pendentes, dados) if d}
+            # Uma única escrita no cache para todo o lote
+            if use_cache:
+                self._armazenar_fundos(novos)
+            fundos.update(novos)
+        
+        return self._resultados_em_ordem(cnpjs, fundos)
+    
+    def get_multiple_fundos(self, cnpjs: List[str], use_cache: bool = True,
+                            concurrency: int = 8) -> Dict[str, Any]:
+        """
+        Obtém dados de múltiplos fundos
+        
+        Com aiohttp as requisições são feitas em paralelo; sem ele (ou de dentro
+        de um event loop), um fundo por vez respeitando o limite de requisições.
         
-        for i, cnpj in enumerate(cnpjs):
-            logger.info(f"Processando fundo {cnpj}... ({i+1}/{len(cnpjs)})")
+        Args:
+            cnpjs: Lista de CNPJs
+            use_cache: Se deve usar cache
+            concurrency: Máximo de requisições simultâneas
             
-            dados = self.get_fundo_data(cnpj, use_cache)
-            if dados:
-                results[cnpj] = dados
-                logger.info(f"✅ {cnpj}: Dados obtidos")
-            else:
-                logger.warning(f"❌ {cnpj}: Erro ao obter dados")
+        Returns:
+            Dicionário com dados dos fundos
+        """
+        if ASYNC_AVAILABLE and len(cnpjs) > 1:
+            # asyncio.run não pode ser chamado de dentro de um event loop (ex.: Jupyter)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                logger.info(f"Processando {len(cnpjs)} fundos em paralelo...")
+                return asyncio.run(self.get_multiple_fundos_async(cnpjs, use_cache, concurrency))
+        
+        fundos = self._fundos_em_cache(cnpjs) if use_cache else {}
+        pendentes = [c for c in dict.fromkeys(cnpjs) if c not in fundos]
+        
+        novos = {}
+        for i, cnpj in enumerate(pendentes):
+            logger.info(f"Processando fundo {cnpj}... ({i+1}/{len(pendentes)})")
             
-            # Delay entre requisições (exceto na última)
-            if i < len(cnpjs) - 1:
-                logger.debug(f"Aguardando {self.delay} segundos...")
-                time.sleep(self.delay)
+            dados = self._buscar_fundo(cnpj)
+            if dados:
+                novos[cnpj] = dados
         
-        return results
+        # Uma única escrita no cache para todo o lote
+        if use_cache:
+            self._armazenar_fundos(novos)
+        fundos.update(novos)
+        
+        return self._resultados_em_ordem(cnpjs, fundos)
     
     def get_fundos_carteira(self, carteira_fundos: List[Dict], use_cache: bool = True) -> Dict[str, Any]:
         """
@@ -265,12 +678,16 @@ class FundosProvider:
             }
         }
         
+        # Todos os fundos de uma vez, em paralelo quando possível
+        cnpjs = list(dict.fromkeys(fundo['cnpj'] for fundo in carteira_fundos if fundo.get('cnpj')))
+        dados_fundos = self.get_multiple_fundos(cnpjs, use_cache)
+        
         for fundo in carteira_fundos:
             cnpj = fundo.get('cnpj')
             valor = fundo.get('valor', 0)
             
             if cnpj:
-                dados = self.get_fundo_data(cnpj, use_cache)
+                dados = dados_fundos.get(cnpj)
                 if dados:
                     carteira_data['fundos'][cnpj] = {
                         'dados_fundo': dados,
@@ -279,13 +696,8 @@ class FundosProvider:
                     }
                     carteira_data['resumo']['fundos_encontrados'] += 1
                     carteira_data['resumo']['valor_total'] += valor
-                    logger.info(f"✅ {cnpj}: Dados obtidos")
                 else:
                     carteira_data['resumo']['fundos_nao_encontrados'] += 1
-                    logger.warning(f"❌ {cnpj}: Dados não encontrados")
-            
-            # Delay entre requisições
-            time.sleep(self.delay)
         
         # Calcular percentuais
         valor_total = carteira_data['resumo']['valor_total']
@@ -320,17 +732,17 @@ class FundosProvider:
         try:
             logger.info(f"Buscando fundos da categoria: {categoria or 'Todas'}")
             
-            # Filtrar fundos do mapeamento por categoria
-            fundos_categoria = []
-            
-            for cnpj, dados in self.mapeamento_fundos.get('mapeamento_fundos', {}).items():
-                if not categoria or categoria.lower() in dados.get('categoria', '').lower():
-                    fundos_categoria.append({
-                        'cnpj': cnpj,
-                        'nome': dados.get('nome', ''),
-                        'categoria': dados.get('categoria', ''),
-                        'slug': dados.get('slug', '')
-                    })
+            # Busca por trecho só entre os nomes de categoria do índice,
+            # e não em todos os fundos
+            if not categoria:
+                fundos_categoria = list(self._by_category[''])
+            else:
+                chave = categoria.casefold()
+                fundos_categoria = [
+                    fundo
+                    for nome, fundos in self._by_category.items() if nome and chave in nome
+                    for fundo in fundos
+                ]
             
             # Armazenar no cache
             if use_cache:
@@ -365,7 +777,7 @@ def test_fundos_provider():
             },
             'persistent': {
                 'enabled': True,
-                'storage_type': 'json',
+                'storage_type': 'pickle',
                 'directory': 'test_fundos_cache',
                 'backup_enabled': False,
                 'backup_interval': 3600
@@ -8,11 +8,20 @@ Integra com Cache Manager e evita rate limiting
 import sys
 import os
 import time
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 import requests
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Sem aiohttp, a busca em lote não está disponível e o DataManager usa o executor
+ASYNC_AVAILABLE = aiohttp is not None
+
 # Adicionar diretórios ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
@@ -22,6 +31,57 @@ from ..models.data_models import DataType, DataSource, DataQuality
 
 logger = logging.getLogger(__name__)
 
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&range=1d"
+QUOTE_SUMMARY_URL = "https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
+QUOTE_SUMMARY_PARAMS = {
+    'modules': 'financialData,quoteType,defaultKeyStatistics,assetProfile,summaryDetail',
+    'formatted': 'false'
+}
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def _parse_chart_meta(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Extrai o bloco 'meta' da resposta do endpoint chart, se houver preço"""
+    if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
+        result = data['chart']['result'][0]
+        if 'meta' in result and 'regularMarketPrice' in result['meta']:
+            return result['meta']
+    return None
+
+
+def _parse_quote_summary(symbol: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extrai os dados relevantes da resposta do endpoint quoteSummary"""
+    stock_data = {
+        'symbol': symbol,
+        'timestamp': datetime.now().isoformat(),
+        'source': 'yahoo_finance'
+    }
+    
+    # Dados financeiros
+    if 'financialData' in data and data['financialData']:
+        fin_data = data['financialData']
+        stock_data.update({
+            'current_price': fin_data.get('currentPrice'),
+            'target_price': fin_data.get('targetMeanPrice'),
+            'pe_ratio': fin_data.get('forwardPE'),
+            'market_cap': fin_data.get('marketCap'),
+            'beta': fin_data.get('beta')
+        })
+    
+    # Dados do resumo
+    if 'summaryDetail' in data and data['summaryDetail']:
+        sum_data = data['summaryDetail']
+        stock_data.update({
+            'volume': sum_data.get('volume'),
+            'avg_volume': sum_data.get('averageVolume'),
+            'day_high': sum_data.get('dayHigh'),
+            'day_low': sum_data.get('dayLow'),
+            'open': sum_data.get('open'),
+            'previous_close': sum_data.get('previousClose')
+        })
+    
+    return stock_data
+
 class YahooFinanceProvider:
     """
     Provider otimizado para Yahoo Finance com cache integrado
@@ -39,7 +99,7 @@ class YahooFinanceProvider:
         self.delay = delay_between_requests
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': USER_AGENT
         })
         
         logger.info(f"Yahoo Finance Provider inicializado com delay de {self.delay}s")
@@ -61,36 +121,34 @@ class YahooFinanceProvider:
         if use_cache:
             cached_data = self.cache_manager.get(cache_key)
             if cached_data:
-                logger.debug(f"Cache hit para {symbol}: {cached_data}")
+                logger.debug("Cache hit para %s: %s", symbol, cached_data)
                 return cached_data
         
         # Buscar dados reais
         try:
             logger.info(f"Buscando preço real para {symbol}...")
             
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&range=1d"
+            url = CHART_URL.format(symbol=symbol)
             response = self.session.get(url, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
-                if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                    result = data['chart']['result'][0]
-                    if 'meta' in result and 'regularMarketPrice' in result['meta']:
-                        price = result['meta']['regularMarketPrice']
-                        
-                        # Armazenar no cache
-                        if use_cache:
-                            self.cache_manager.set(
-                                key=cache_key,
-                                data=price,
-                                data_type=DataType.STOCK,
-                                expires_in=300,  # 5 minutos
-                                source=DataSource.YAHOO_FINANCE,
-                                quality=DataQuality.GOOD
-                            )
-                            logger.debug(f"Preço de {symbol} armazenado no cache: {price}")
-                        
-                        return price
+                meta = _parse_chart_meta(response.json())
+                if meta is not None:
+                    price = meta['regularMarketPrice']
+                    
+                    # Armazenar no cache
+                    if use_cache:
+                        self.cache_manager.set(
+                            key=cache_key,
+                            data=price,
+                            data_type=DataType.STOCK,
+                            expires_in=300,  # 5 minutos
+                            source=DataSource.YAHOO_FINANCE,
+                            quality=DataQuality.GOOD
+                        )
+                        logger.debug("Preço de %s armazenado no cache: %s", symbol, price)
+                    
+                    return price
             
             elif response.status_code == 429:
                 logger.warning(f"Rate limit atingido para {symbol}. Aguardando 10 segundos...")
@@ -104,17 +162,201 @@ class YahooFinanceProvider:
             logger.error(f"Erro ao buscar {symbol}: {e}")
             return None
     
-    def get_multiple_prices(self, symbols: List[str], use_cache: bool = True) -> Dict[str, float]:
+    def get_stock_prices(self, symbols: List[str],
+                         timeout: float = 15) -> Dict[str, Tuple[float, Optional[float]]]:
+        """
+        Obtém preços de vários símbolos numa única chamada yfinance.download
+        
+        Não usa o cache: quem chama já filtrou os símbolos que estavam em cache.
+        
+        Args:
+            symbols: Lista de símbolos
+            timeout: Timeout da requisição em segundos
+            
+        Returns:
+            Dicionário símbolo -> (preço, fechamento anterior) dos encontrados
+        """
+        try:
+            # Import pesado, feito só quando o lote é usado
+            import yfinance as yf
+        except ImportError:
+            logger.debug("yfinance não está instalado; download em lote indisponível")
+            return {}
+        
+        try:
+            logger.info(f"Baixando {len(symbols)} símbolos em lote...")
+            frame = yf.download(
+                tickers=list(symbols),
+                period="5d",
+                interval="1d",
+                group_by="ticker",
+                auto_adjust=False,
+                threads=True,
+                progress=False,
+                timeout=timeout
+            )
+        except Exception as e:
+            logger.error(f"Erro no download em lote: {e}")
+            return {}
+        
+        if frame is None or frame.empty:
+            return {}
+        
+        results = {}
+        multi_index = frame.columns.nlevels > 1
+        for symbol in symbols:
+            try:
+                closes = (frame[symbol]['Close'] if multi_index else frame['Close']).dropna()
+            except KeyError:
+                continue
+            if closes.empty:
+                continue
+            previous_close = float(closes.iloc[-2]) if len(closes) > 1 else None
+            results[symbol] = (float(closes.iloc[-1]), previous_close)
+        
+        return results
+    
+    async def _fetch_json_async(self, symbols: List[str], url: str,
+                                params: Optional[Dict[str, str]] = None, concurrency: int = 20,
+                                timeout: float = 15) -> Dict[str, Dict[str, Any]]:
+        """
+        GET da url (formatada com o símbolo) de vários símbolos numa única sessão aiohttp
+        
+        Returns:
+            Dicionário símbolo -> JSON dos que responderam com status 200
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp não está instalado")
+        
+        async def fetch_one(session, symbol):
+            try:
+                async with session.get(url.format(symbol=symbol), params=params) as response:
+                    if response.status != 200:
+                        logger.warning(f"Erro ao buscar {symbol}: Status {response.status}")
+                        return symbol, None
+                    return symbol, await response.json(content_type=None)
+            except Exception as e:
+                logger.error(f"Erro ao buscar {symbol}: {e}")
+                return symbol, None
+        
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as session:
+            results = await asyncio.gather(*(fetch_one(session, s) for s in symbols))
+        
+        return {symbol: data for symbol, data in results if data is not None}
+    
+    async def fetch_quotes_async(self, symbols: List[str], concurrency: int = 20,
+                                 timeout: float = 15) -> Dict[str, Tuple[float, Optional[float]]]:
+        """
+        Busca preços de vários símbolos em paralelo numa única sessão aiohttp
+        
+        Não usa o cache nem o delay entre requisições: quem chama já filtrou
+        os símbolos que estavam em cache.
+        
+        Args:
+            symbols: Lista de símbolos
+            concurrency: Máximo de conexões simultâneas
+            timeout: Timeout total de cada requisição em segundos
+            
+        Returns:
+            Dicionário símbolo -> (preço, fechamento anterior) dos que responderam
+        """
+        payloads = await self._fetch_json_async(symbols, CHART_URL, concurrency=concurrency,
+                                                timeout=timeout)
+        
+        quotes = {}
+        for symbol, data in payloads.items():
+            meta = _parse_chart_meta(data)
+            if meta is not None:
+                quotes[symbol] = (meta['regularMarketPrice'], meta.get('chartPreviousClose'))
+        return quotes
+    
+    async def get_multiple_prices_async(self, symbols: List[str], use_cache: bool = True,
+                                        concurrency: int = 8, timeout: float = 15) -> Dict[str, float]:
+        """
+        Obtém preços de múltiplas ações em paralelo com fetch_quotes_async
+        
+        Os símbolos em cache não vão à rede; os novos preços são gravados no
+        cache de uma só vez.
+        
+        Args:
+            symbols: Lista de símbolos
+            use_cache: Se deve usar cache
+            concurrency: Máximo de requisições simultâneas
+            timeout: Timeout total de cada requisição em segundos
+            
+        Returns:
+            Dicionário com símbolo -> preço
+        """
+        prices = self._cached(symbols, "yahoo_price_") if use_cache else {}
+        pendentes = [s for s in dict.fromkeys(symbols) if s not in prices]
+        
+        if pendentes:
+            quotes = await self.fetch_quotes_async(pendentes, concurrency, timeout)
+            novos = {symbol: price for symbol, (price, _) in quotes.items() if price}
+            if use_cache and novos:
+                self.cache_manager.set_many(
+                    {f"yahoo_price_{symbol}": price for symbol, price in novos.items()},
+                    data_type=DataType.STOCK,
+                    expires_in=300,  # 5 minutos
+                    source=DataSource.YAHOO_FINANCE,
+                    quality=DataQuality.GOOD
+                )
+            prices.update(novos)
+        
+        results = {}
+        for symbol in symbols:
+            price = prices.get(symbol)
+            if price:
+                results[symbol] = price
+                logger.info(f"✅ {symbol}: ${price:.2f}")
+            else:
+                logger.warning(f"❌ {symbol}: Erro ao obter preço")
+        
+        return results
+    
+    def _cached(self, symbols: List[str], prefix: str) -> Dict[str, Any]:
+        """Valores já em cache dos símbolos, numa única consulta ao cache"""
+        keys = {f"{prefix}{symbol}": symbol for symbol in symbols}
+        found = self.cache_manager.get_many(list(keys))
+        return {keys[key]: value for key, value in found.items() if value}
+    
+    @staticmethod
+    def _can_run_async(symbols: List[str]) -> bool:
+        """asyncio.run só vale a pena com mais de um símbolo e fora de um event loop"""
+        if not ASYNC_AVAILABLE or len(symbols) < 2:
+            return False
+        # asyncio.run não pode ser chamado de dentro de um event loop (ex.: Jupyter)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        return False
+    
+    def get_multiple_prices(self, symbols: List[str], use_cache: bool = True,
+                            concurrency: int = 8) -> Dict[str, float]:
         """
-        Obtém preços de múltiplas ações com cache e delays adequados
+        Obtém preços de múltiplas ações com cache
+        
+        Com aiohttp as requisições são feitas em paralelo; sem ele (ou de dentro
+        de um event loop), um símbolo por vez com o delay entre requisições.
         
         Args:
             symbols: Lista de símbolos
             use_cache: Se deve usar cache
+            concurrency: Máximo de requisições simultâneas
             
         Returns:
             Dicionário com símbolo -> preço
         """
+        if self._can_run_async(symbols):
+            logger.info(f"Processando {len(symbols)} símbolos em paralelo...")
+            return asyncio.run(self.get_multiple_prices_async(symbols, use_cache, concurrency))
+        
         results = {}
         
         for i, symbol in enumerate(symbols):
@@ -129,7 +371,7 @@ class YahooFinanceProvider:
             
             # Delay entre requisições (exceto na última)
             if i < len(symbols) - 1:
-                logger.debug(f"Aguardando {self.delay} segundos...")
+                logger.debug("Aguardando %s segundos...", self.delay)
                 time.sleep(self.delay)
         
         return results
@@ -151,53 +393,18 @@ class YahooFinanceProvider:
         if use_cache:
             cached_data = self.cache_manager.get(cache_key)
             if cached_data:
-                logger.debug(f"Cache hit para dados de {symbol}")
+                logger.debug("Cache hit para dados de %s", symbol)
                 return cached_data
         
         # Buscar dados reais
         try:
             logger.info(f"Buscando dados completos para {symbol}...")
             
-            url = f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
-            params = {
-                'modules': 'financialData,quoteType,defaultKeyStatistics,assetProfile,summaryDetail',
-                'formatted': 'false'
-            }
-            
-            response = self.session.get(url, params=params, timeout=15)
+            url = QUOTE_SUMMARY_URL.format(symbol=symbol)
+            response = self.session.get(url, params=QUOTE_SUMMARY_PARAMS, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
-                
-                # Extrair dados relevantes
-                stock_data = {
-                    'symbol': symbol,
-                    'timestamp': datetime.now().isoformat(),
-                    'source': 'yahoo_finance'
-                }
-                
-                # Dados financeiros
-                if 'financialData' in data and data['financialData']:
-                    fin_data = data['financialData']
-                    stock_data.update({
-                        'current_price': fin_data.get('currentPrice'),
-                        'target_price': fin_data.get('targetMeanPrice'),
-                        'pe_ratio': fin_data.get('forwardPE'),
-                        'market_cap': fin_data.get('marketCap'),
-                        'beta': fin_data.get('beta')
-                    })
-                
-                # Dados do resumo
-                if 'summaryDetail' in data and data['summaryDetail']:
-                    sum_data = data['summaryDetail']
-                    stock_data.update({
-                        'volume': sum_data.get('volume'),
-                        'avg_volume': sum_data.get('averageVolume'),
-                        'day_high': sum_data.get('dayHigh'),
-                        'day_low': sum_data.get('dayLow'),
-                        'open': sum_data.get('open'),
-                        'previous_close': sum_data.get('previousClose')
-                    })
+                stock_data = _parse_quote_summary(symbol, response.json())
                 
                 # Armazenar no cache
                 if use_cache:
@@ -209,7 +416,7 @@ class YahooFinanceProvider:
                         source=DataSource.YAHOO_FINANCE,
                         quality=DataQuality.GOOD
                     )
-                    logger.debug(f"Dados de {symbol} armazenados no cache")
+                    logger.debug("Dados de %s armazenados no cache", symbol)
                 
                 return stock_data
             
@@ -225,6 +432,40 @@ class YahooFinanceProvider:
             logger.error(f"Erro ao buscar dados de {symbol}: {e}")
             return None
     
+    async def get_multiple_stock_data_async(self, symbols: List[str], use_cache: bool = True,
+                                            concurrency: int = 8, timeout: float = 15) -> Dict[str, Any]:
+        """
+        Obtém dados completos de múltiplas ações em paralelo (mesma sessão e
+        tratamento de erros de fetch_quotes_async)
+        
+        Args:
+            symbols: Lista de símbolos
+            use_cache: Se deve usar cache
+            concurrency: Máximo de requisições simultâneas
+            timeout: Timeout total de cada requisição em segundos
+            
+        Returns:
+            Dicionário símbolo -> dados, só com os símbolos obtidos
+        """
+        stock_data = self._cached(symbols, "yahoo_data_") if use_cache else {}
+        pendentes = [s for s in dict.fromkeys(symbols) if s not in stock_data]
+        
+        if pendentes:
+            payloads = await self._fetch_json_async(pendentes, QUOTE_SUMMARY_URL, QUOTE_SUMMARY_PARAMS,
+                                                    concurrency, timeout)
+            novos = {symbol: _parse_quote_summary(symbol, data) for symbol, data in payloads.items()}
+            if use_cache and novos:
+                self.cache_manager.set_many(
+                    {f"yahoo_data_{symbol}": data for symbol, data in novos.items()},
+                    data_type=DataType.STOCK,
+                    expires_in=600,  # 10 minutos
+                    source=DataSource.YAHOO_FINANCE,
+                    quality=DataQuality.GOOD
+                )
+            stock_data.update(novos)
+        
+        return stock_data
+    
     def get_portfolio_data(self, symbols: List[str], use_cache: bool = True) -> Dict[str, Any]:
         """
         Obtém dados de um portfólio de ações
@@ -249,9 +490,14 @@ class YahooFinanceProvider:
             }
         }
         
+        # Em paralelo, todos os símbolos de uma vez; os que estão em cache não vão à rede
+        batch = None
+        if self._can_run_async(symbols):
+            batch = asyncio.run(self.get_multiple_stock_data_async(symbols, use_cache))
+        
         for i, symbol in enumerate(symbols):
             try:
-                data = self.get_stock_data(symbol, use_cache)
+                data = batch.get(symbol) if batch is not None else self.get_stock_data(symbol, use_cache)
                 if data:
                     portfolio_data['data'][symbol] = data
                     portfolio_data['summary']['successful_requests'] += 1
@@ -260,8 +506,8 @@ class YahooFinanceProvider:
                     portfolio_data['summary']['failed_requests'] += 1
                     logger.warning(f"❌ {symbol}: Falha ao obter dados")
                 
-                # Delay entre requisições
-                if i < len(symbols) - 1:
+                # Delay entre requisições (só na busca sequencial)
+                if batch is None and i < len(symbols) - 1:
                     time.sleep(self.delay)
                     
             except Exception as e:
@@ -298,7 +544,7 @@ def test_yahoo_provider():
             },
             'persistent': {
                 'enabled': True,
-                'storage_type': 'json',
+                'storage_type': 'pickle',
                 'directory': 'test_yahoo_cache',
                 'backup_enabled': False,
                 'backup_interval': 3600
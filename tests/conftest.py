@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Configuração comum dos testes
+"""
+
+import os
+import sys
+
+# Raiz do projeto no path, para importar sistema_obtencao_dados e scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
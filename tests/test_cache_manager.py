@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do CacheManager (sistema_obtencao_dados.core.cache_manager)
+"""
+
+import heapq
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from sistema_obtencao_dados.core import cache_manager
+from sistema_obtencao_dados.core.cache_manager import (
+    AdaptiveTTL, CacheManager, MsgpackSerializer, PickleSerializer
+)
+from sistema_obtencao_dados.models.data_models import (
+    DataQuality, DataSource, DataType, PriceData
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.cache]
+
+
+def _config(directory, **persistent):
+    return {
+        'memory': {'max_size': 100, 'cleanup_interval': 300},
+        'persistent': {
+            'enabled': True,
+            'directory': str(directory),
+            'backup_enabled': False,
+            'backup_interval': 3600,
+            **persistent
+        }
+    }
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    """Cria CacheManagers em tmp_path/cache e encerra todos no final"""
+    managers = []
+    
+    def make(**kwargs):
+        manager = CacheManager(_config(tmp_path / "cache"), **kwargs)
+        managers.append(manager)
+        return manager
+    
+    yield make
+    for manager in managers:
+        manager.shutdown()
+
+
+def test_foreign_files_in_cache_directory_are_kept(tmp_path, make_cache):
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    # Entrada e índice do formato JSON antigo, e um arquivo qualquer do usuário
+    legacy_entry = directory / "13b88cb90c511c0de3a041480f1615ea.json"
+    legacy_index = directory / "cache_index.json"
+    user_file = directory / "notas.json"
+    for path in (legacy_entry, legacy_index, user_file):
+        path.write_text("{}", encoding='utf-8')
+    
+    make_cache()
+    
+    assert legacy_entry.exists() and legacy_index.exists() and user_file.exists()
+
+
+def test_set_many_and_get_many(make_cache):
+    cache = make_cache()
+    cache.set_many({'a': 1, 'b': 2}, DataType.STOCK, expires_in=300)
+    
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'b': 2}
+    assert cache.stats.sets == 2
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+
+
+def test_expired_entries_are_misses_until_cleanup(make_cache):
+    cache = make_cache()
+    cache.set_many({'a': 1, 'b': 2}, DataType.STOCK, expires_in=300)
+    cache._flush_dirty()
+    cache.memory_cache['a'].expires_at_mono = 0.0
+    heapq.heappush(cache._expiry_heap, (0.0, 'a'))
+    
+    assert cache.get_many(['a', 'b']) == {'b': 2}
+    assert cache.get('a') is None
+    assert cache.peek('a') is None
+    assert not cache.exists('a')
+    assert cache.stats.misses == 2
+    
+    # A leitura não altera o cache; quem remove a entrada é a limpeza
+    assert 'a' in cache.memory_cache
+    cache._cleanup_expired_entries()
+    assert 'a' not in cache.memory_cache
+    assert cache._dirty_keys == {'a'}
+
+
+class _RecordingRWLock:
+    """RWLockFair de teste: registra o lado pedido (os dois excluem entre si)"""
+    
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.sides = []
+    
+    def _side(self, side):
+        self.sides.append(side)
+        return self.lock
+    
+    def gen_rlock(self):
+        return self._side('read')
+    
+    def gen_wlock(self):
+        return self._side('write')
+
+
+def test_reads_take_the_read_side_of_the_rw_lock(make_cache, monkeypatch):
+    monkeypatch.setattr(cache_manager, 'rwlock', SimpleNamespace(RWLockFair=_RecordingRWLock))
+    cache = make_cache()
+    cache.set_many({'a': 1, 'b': 2}, DataType.STOCK, expires_in=300)
+    cache._rwlock.sides.clear()
+    
+    assert cache.get('a') == 1
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'b': 2}
+    assert cache.peek('b') == 2
+    assert cache.get_keys('a*') == ('a',)
+    assert cache.get_stats()['hits'] == 3
+    
+    assert set(cache._rwlock.sides) == {'read'}
+    # O hit mais recente vai para o fim do LRU
+    assert list(cache.memory_cache) == ['a', 'b']
+    assert cache.memory_cache['a'].access_count == 2
+
+
+def test_set_many_applies_ttl_policy_per_key(make_cache):
+    ttls = {'a': 60, 'b': 600}
+    cache = make_cache(ttl_policy=lambda key, data_type, expires_in: ttls[key])
+    cache.set_many({'a': 1, 'b': 2}, DataType.FUND, expires_in=300)
+    
+    entries = cache.memory_cache
+    lifetime = {key: (entries[key].expires_at - entries[key].timestamp).total_seconds() for key in ttls}
+    assert lifetime == {'a': 60, 'b': 600}
+
+
+@pytest.mark.parametrize('serializer', ['pickle', 'msgpack'])
+def test_dirty_entries_are_flushed_and_reloaded(make_cache, serializer):
+    if serializer == 'msgpack' and cache_manager.msgpack is None:
+        pytest.skip("msgpack não está instalado")
+    serializer_cls = cache_manager.SERIALIZERS[serializer]
+    
+    cache = make_cache(serializer=serializer_cls())
+    cache.set('price', 38.5, DataType.STOCK, expires_in=300,
+              source=DataSource.YAHOO_FINANCE, quality=DataQuality.GOOD)
+    cache.set_many({'a': 1, 'b': 2}, DataType.STOCK)
+    cache.set('removed', 0, DataType.STOCK)
+    cache._flush_dirty()
+    assert not cache._dirty_keys
+    assert len(list(cache.entries_dir.iterdir())) == 4
+    
+    cache.delete('removed')
+    assert cache._dirty_keys == {'removed'}
+    cache._flush_dirty()
+    assert not cache._dirty_keys
+    files = sorted(path.suffix for path in cache.entries_dir.iterdir())
+    assert files == [serializer_cls.suffix] * 3
+    
+    reloaded = make_cache(serializer=serializer_cls())
+    assert reloaded.get_many(['price', 'a', 'b', 'removed']) == {'price': 38.5, 'a': 1, 'b': 2}
+    entry = reloaded.memory_cache['price']
+    assert entry.source == DataSource.YAHOO_FINANCE
+    assert entry.quality == DataQuality.GOOD
+    assert not entry.is_expired()
+    assert reloaded.memory_cache['a'].expires_at is None
+
+
+def test_adaptive_ttl_grows_for_frequent_keys_and_resets():
+    policy = AdaptiveTTL(data_types=(DataType.FUND,), max_ttl=1000, growth=2)
+    
+    assert policy('k', DataType.STOCK, 100) == 100
+    assert policy('k', DataType.FUND, 100) == 100
+    # Gravada de novo logo: o TTL cresce até max_ttl
+    assert policy('k', DataType.FUND, 100) == 200
+    assert policy('k', DataType.FUND, 100) == 400
+    assert policy('k', DataType.FUND, 100) == 800
+    assert policy('k', DataType.FUND, 100) == 1000
+    
+    # Pedida de novo bem depois de expirar: volta ao TTL pedido
+    ttl, set_at = policy._history['k']
+    policy._history['k'] = (ttl, set_at - 3 * ttl)
+    assert policy('k', DataType.FUND, 100) == 100
+
+
+def test_adaptive_ttl_keeps_at_most_max_keys():
+    policy = AdaptiveTTL(max_keys=2)
+    for key in ('a', 'b', 'c'):
+        policy(key, DataType.FUND, 100)
+    
+    assert list(policy._history) == ['b', 'c']
+
+
+PRICE = PriceData(
+    symbol='PETR4.SA',
+    price=38.5,
+    currency='BRL',
+    timestamp=datetime(2024, 1, 2, 10, 30),
+    source=DataSource.YAHOO_FINANCE,
+    quality=DataQuality.GOOD,
+    change_24h=0.5
+)
+
+
+@pytest.mark.parametrize('serializer_cls', [PickleSerializer, MsgpackSerializer])
+def test_serializer_round_trip(serializer_cls):
+    if serializer_cls is MsgpackSerializer and cache_manager.msgpack is None:
+        pytest.skip("msgpack não está instalado")
+    serializer = serializer_cls()
+    obj = {'price': PRICE, 'prices': [PRICE], 'at': datetime(2024, 1, 2), 'n': 1, 'name': 'x'}
+    
+    assert serializer.loads(serializer.dumps(obj)) == obj
+
+
+def test_msgpack_serializer_rejects_unknown_types():
+    if cache_manager.msgpack is None:
+        pytest.skip("msgpack não está instalado")
+    
+    with pytest.raises(TypeError):
+        MsgpackSerializer().dumps(object())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do DataManager (sistema_obtencao_dados.core.data_manager)
+"""
+
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+
+from sistema_obtencao_dados.core.data_manager import DataManager, _Counter
+from sistema_obtencao_dados.models.data_models import (
+    DATA_QUALITY_ORDER, DataQuality, DataSource, DataType, PriceData
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.cache]
+
+CONFIG_PATH = Path(__file__).parent.parent / "sistema_obtencao_dados" / "config.yaml"
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    """DataManager com o config.yaml do projeto e o cache num diretório temporário"""
+    config = yaml.safe_load(CONFIG_PATH.read_text(encoding='utf-8'))
+    config['cache']['persistent']['directory'] = str(tmp_path / "cache")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config), encoding='utf-8')
+    
+    manager = DataManager(str(config_path), owned_executor=True)
+    yield manager
+    manager.shutdown()
+
+
+def test_concurrent_requests_for_one_key_fetch_once(data_manager):
+    calls = []
+    release = threading.Event()
+    
+    def fetcher():
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+        return 42.0
+    
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(data_manager._get_or_fetch("k", fetcher)))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    # O segundo pedido chega com a primeira busca em andamento
+    while "k" not in data_manager._inflight:
+        time.sleep(0.01)
+    threads[1].start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(calls) == 1
+    assert results == [42.0, 42.0]
+
+
+def test_miss_is_counted_once(data_manager):
+    data_manager._get_or_fetch("k", lambda: 42.0)
+    
+    stats = data_manager.cache_manager.stats
+    assert stats.misses == 1
+    assert stats.hits == 0
+
+
+def test_failed_batch_symbols_are_not_fetched_again(data_manager, monkeypatch):
+    provider = data_manager.providers['yahoo_finance']
+    requested = []
+    
+    async def fetch_quotes_async(symbols, timeout=15):
+        requested.extend(symbols)
+        return {'PETR4.SA': (38.5, 38.0)}
+    
+    def get_stock_price(symbol):
+        requested.append(symbol)
+        return None
+    
+    monkeypatch.setattr(provider, 'get_stock_prices', lambda symbols, timeout=15: {})
+    monkeypatch.setattr(provider, 'fetch_quotes_async', fetch_quotes_async)
+    data_manager._provider_chain[DataType.STOCK] = [(DataSource.YAHOO_FINANCE, get_stock_price)]
+    
+    data_manager.fallback_config['use_simulated_data'] = False
+    
+    results = data_manager.get_multiple_stocks(['PETR4.SA', 'XXXX3.SA'], force_refresh=True)
+    
+    assert list(results) == ['PETR4.SA']
+    assert requested == ['PETR4.SA', 'XXXX3.SA']
+    assert data_manager._cnt_errors.value == 1
+    
+    # Com dados simulados, o símbolo recusado pelo lote ainda vem do fallback
+    data_manager.fallback_config['use_simulated_data'] = True
+    requested.clear()
+    
+    results = data_manager.get_multiple_stocks(['PETR4.SA', 'XXXX3.SA'], force_refresh=True)
+    
+    assert requested == ['PETR4.SA', 'XXXX3.SA']
+    assert results['XXXX3.SA'].source == DataSource.SIMULATED
+    assert results['XXXX3.SA'].metadata == {'simulated': True}
+    assert data_manager._cnt_errors.value == 2
+    assert data_manager._cnt_fallbacks.value == 1
+
+
+def test_counter():
+    counter = _Counter()
+    assert counter.value == 0
+    
+    counter.increment()
+    counter.increment()
+    counter.add(5)
+    
+    # Ler não altera a contagem
+    assert counter.value == 7
+    assert counter.value == 7
+
+
+def test_counter_is_exact_under_concurrent_increments():
+    counter = _Counter()
+    
+    def work():
+        for _ in range(10000):
+            counter.increment()
+    
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert counter.value == 40000
+
+
+def test_get_multiple_stocks_soa(data_manager, monkeypatch):
+    timestamp = datetime(2024, 1, 2, 10, 30)
+    prices = {
+        'PETR4.SA': PriceData(symbol='PETR4.SA', price=38.5, currency='BRL', timestamp=timestamp,
+                              quality=DataQuality.GOOD, change_24h=0.5, change_percent_24h=1.3),
+        'VALE3.SA': PriceData(symbol='VALE3.SA', price=60.0, currency='BRL', timestamp=timestamp,
+                              quality=DataQuality.FAIR),
+    }
+    # DataManager tem __slots__: o método é trocado na classe
+    monkeypatch.setattr(DataManager, 'get_multiple_stocks',
+                        lambda self, symbols, force_refresh=False: dict(prices))
+    
+    frame = data_manager.get_multiple_stocks_soa(['VALE3.SA', 'XXXX3.SA', 'PETR4.SA', 'VALE3.SA'])
+    
+    # Na ordem pedida, sem repetidos nem os símbolos não obtidos
+    assert len(frame) == 2
+    assert frame.symbols.tolist() == ['VALE3.SA', 'PETR4.SA']
+    assert frame.prices.tolist() == [60.0, 38.5]
+    assert np.isnan(frame.change_24h[0]) and frame.change_24h[1] == 0.5
+    assert np.isnan(frame.change_percent_24h[0]) and frame.change_percent_24h[1] == 1.3
+    assert frame.timestamps.tolist() == [timestamp, timestamp]
+    assert [DATA_QUALITY_ORDER[code] for code in frame.quality] == [DataQuality.FAIR, DataQuality.GOOD]
+    assert list(frame.to_dict()) == ['symbols', 'currencies', 'prices', 'change_24h',
+                                     'change_percent_24h', 'timestamps', 'quality']
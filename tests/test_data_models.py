@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes dos modelos de dados (sistema_obtencao_dados.models.data_models)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from sistema_obtencao_dados.models import data_models
+from sistema_obtencao_dados.models.data_models import (
+    CacheEntry, DataQuality, DataSource, DataType, HistoricalData,
+    deserialize_dataclass, serialize_dataclass
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _cache_entry() -> CacheEntry:
+    return CacheEntry(
+        key='yahoo_price_PETR4.SA',
+        data=38.5,
+        data_type=DataType.STOCK,
+        expires_at=datetime.now() + timedelta(hours=1),
+        source=DataSource.YAHOO_FINANCE,
+        quality=DataQuality.GOOD
+    )
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_cache_entry_round_trip(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(data_models, 'orjson', None)
+    elif data_models.orjson is None:
+        pytest.skip("orjson não está instalado")
+    
+    entry = _cache_entry()
+    serialized = serialize_dataclass(entry)
+    
+    assert 'expires_at_mono' not in serialized
+    restored = deserialize_dataclass(serialized, CacheEntry)
+    assert restored == entry
+    assert not restored.is_expired()
+
+
+def test_serialized_cache_entry_is_the_same_with_and_without_orjson(monkeypatch):
+    if data_models.orjson is None:
+        pytest.skip("orjson não está instalado")
+    
+    entry = _cache_entry()
+    with_orjson = data_models.orjson.loads(serialize_dataclass(entry))
+    monkeypatch.setattr(data_models, 'orjson', None)
+    without_orjson = data_models.json.loads(serialize_dataclass(entry))
+    
+    assert with_orjson == without_orjson
+
+
+def test_expires_at_mono_is_derived_from_expires_at():
+    data = _cache_entry().to_dict()
+    # Valor de outro processo: deve ser ignorado e recalculado
+    data['expires_at_mono'] = 1.0
+    
+    restored = CacheEntry.from_dict(data)
+    
+    assert restored.expires_at_mono > 1.0
+    assert not restored.is_expired()
+    with pytest.raises(TypeError):
+        CacheEntry(key='k', data=1, data_type=DataType.STOCK, expires_at_mono=1.0)
+
+
+def test_cache_entry_without_expiration_never_expires():
+    entry = CacheEntry(key='k', data=1, data_type=DataType.STOCK)
+    
+    assert entry.expires_at_mono == float('inf')
+    assert not entry.is_expired()
+
+
+BARS = [
+    {'date': '2024-01-02T00:00:00', 'open': 37.5, 'high': 38.25, 'low': 37.0, 'close': 38.0, 'volume': 1000},
+    {'date': '2024-01-03T00:00:00', 'open': 38.0, 'high': 39.5, 'low': 37.75, 'close': 39.25, 'volume': 1500},
+]
+
+
+def _historical(records=BARS) -> HistoricalData:
+    return HistoricalData.from_records(
+        records,
+        symbol='PETR4.SA',
+        data_type=DataType.STOCK,
+        start_date=datetime(2024, 1, 2),
+        end_date=datetime(2024, 1, 3)
+    )
+
+
+def test_historical_data_keeps_records_as_public_data():
+    historical = _historical()
+    
+    assert historical.data == BARS
+    assert historical.records() == BARS
+    assert len(historical) == 2
+    assert historical.data[1]['close'] == 39.25
+
+
+def test_historical_data_columns_round_trip():
+    columns = _historical().columns()
+    
+    assert columns['close'].tolist() == [38.0, 39.25]
+    assert columns['date'].dtype.kind == 'M'
+    
+    restored = HistoricalData.from_columns(
+        columns, symbol='PETR4.SA', data_type=DataType.STOCK,
+        start_date=datetime(2024, 1, 2), end_date=datetime(2024, 1, 3)
+    ).records()
+    for original, record in zip(BARS, restored):
+        assert datetime.fromisoformat(record.pop('date')) == datetime.fromisoformat(original['date'])
+        assert record == {name: value for name, value in original.items() if name != 'date'}
+
+
+def test_historical_data_dict_round_trip():
+    historical = _historical()
+    
+    restored = HistoricalData.from_dict(historical.to_dict())
+    
+    assert restored == historical
+    # Formato em colunas também é aceito
+    columnar = dict(historical.to_dict(), data={name: [bar[name] for bar in BARS] for name in BARS[0]})
+    assert HistoricalData.from_dict(columnar).records() == BARS
+
+
+def test_historical_data_columns_keep_source_precision():
+    bars = [dict(bar, close=bar['close'] + 0.01) for bar in BARS]
+    historical = _historical(bars)
+    
+    assert historical.columns()['close'].dtype == 'float64'
+    assert historical.columns()['close'].tolist() == [bar['close'] for bar in bars]
+    
+    compact = historical.columns(compact=True)
+    assert compact['close'].dtype == 'float32'
+    assert compact['volume'].tolist() == [1000, 1500]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes dos índices do mapeamento de fundos (sistema_obtencao_dados.providers.fundos_provider)
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from sistema_obtencao_dados.providers.fundos_provider import (
+    FundosProvider, _build_indexes, _build_mapping_indexes, _cnpj_digits,
+    _fundo_cache_key, _load_mapping
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.fund]
+
+FUNDOS = {
+    '04.305.193/0001-40': {'nome': 'Fundo A', 'categoria': 'Ações', 'slug': 'fundo-a'},
+    '11.222.333/0001-81': {'nome': 'Fundo B', 'categoria': 'Renda Fixa', 'slug': 'fundo-b'},
+    '22.333.444/0001-55': {'nome': 'Fundo C', 'categoria': 'AÇÕES', 'slug': 'fundo-c'},
+    '33.444.555/0001-90': {'nome': 'Fundo D'},
+}
+
+
+def test_cnpj_digits():
+    assert _cnpj_digits('04.305.193/0001-40') == '04305193000140'
+    assert _cnpj_digits(' 04305193000140 ') == '04305193000140'
+
+
+def test_fundo_cache_key_is_shared_by_cnpj_formats():
+    key = _fundo_cache_key('04.305.193/0001-40')
+    
+    assert key == 'fundo_data_04305193000140'
+    assert _fundo_cache_key('04305193000140') is key
+
+
+def test_build_indexes():
+    by_digits, by_category = _build_indexes(FUNDOS)
+    
+    assert by_digits['04305193000140'] is FUNDOS['04.305.193/0001-40']
+    assert len(by_digits) == 4
+    # '' guarda todos os fundos, na ordem do mapeamento
+    assert [fundo['cnpj'] for fundo in by_category['']] == list(FUNDOS)
+    assert by_category[''][3] == {'cnpj': '33.444.555/0001-90', 'nome': 'Fundo D',
+                                  'categoria': '', 'slug': ''}
+    # Categorias sem distinção de maiúsculas; fundos sem categoria só em ''
+    assert set(by_category) == {'', 'ações', 'renda fixa'}
+    assert [fundo['slug'] for fundo in by_category['ações']] == ['fundo-a', 'fundo-c']
+    assert by_category['ações'][0] is by_category[''][0]
+
+
+@pytest.fixture
+def mapping_path(tmp_path):
+    path = tmp_path / "mapeamento_fundos.json"
+    path.write_text(json.dumps({'versao': 1, 'mapeamento_fundos': FUNDOS}), encoding='utf-8')
+    return str(path)
+
+
+def test_build_mapping_indexes(mapping_path):
+    mapeamento, by_digits, by_category = _build_mapping_indexes(mapping_path)
+    
+    assert mapeamento['versao'] == 1
+    assert (by_digits, by_category) == _build_indexes(FUNDOS)
+
+
+def test_load_mapping_reuses_indexes_until_the_file_changes(mapping_path):
+    mtime_ns = os.stat(mapping_path).st_mtime_ns
+    indexes = _load_mapping(mapping_path, mtime_ns)
+    
+    assert os.path.exists(mapping_path + '.cache.pkl')
+    assert _load_mapping(mapping_path, mtime_ns) is indexes
+    # Outro processo: lê os índices do .cache.pkl
+    assert _load_mapping.__wrapped__(mapping_path, mtime_ns) == indexes
+    
+    with open(mapping_path, 'w', encoding='utf-8') as f:
+        json.dump({'mapeamento_fundos': {}}, f)
+    _, by_digits, _ = _load_mapping(mapping_path, mtime_ns + 1)
+    assert by_digits == {}
+
+
+DELAY = 0.05
+
+
+class _Response:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    async def read(self):
+        return b''
+
+
+class _Session:
+    """Sessão aiohttp de teste: devolve as respostas na ordem e registra os instantes"""
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requested_at = []
+    
+    def get(self, url):
+        self.requested_at.append(time.monotonic())
+        return self.responses.pop(0)
+
+
+def test_async_requests_share_the_rate_limit():
+    provider = FundosProvider(cache_manager=None, delay_between_requests=DELAY)
+    session = _Session(_Response(200), _Response(429, {'Retry-After': '0'}), _Response(404))
+    
+    async def run():
+        await asyncio.gather(
+            provider._buscar_slug_mais_retorno_async(session, '04305193000140'),
+            provider._extrair_dados_fundo_async(session, 'fundo-a', '04305193000140')
+        )
+    
+    # A requisição síncrona ocupa a janela antes do event loop
+    provider._throttle()
+    requested_at = [provider._bucket[-1]]
+    asyncio.run(run())
+    requested_at += session.requested_at
+    
+    # Uma requisição por janela, inclusive a repetida após o 429
+    assert len(requested_at) == 4
+    gaps = [b - a for a, b in zip(requested_at, requested_at[1:])]
+    assert all(gap >= DELAY * 0.9 for gap in gaps)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes dos kernels numéricos (sistema_obtencao_dados.core._kernels)
+"""
+
+import numpy as np
+import pytest
+
+from sistema_obtencao_dados.core import _kernels
+
+pytestmark = pytest.mark.unit
+
+PRICES = np.array([38.5, 10.0, 5.0, 7.25, 1.0])
+PREVIOUS = np.array([38.0, 0.0, np.nan, 7.25, 2.0])
+
+
+def test_numpy_price_changes():
+    change, change_pct = _kernels._price_changes_numpy(PRICES, PREVIOUS)
+    
+    np.testing.assert_allclose(change, [0.5, 10.0, np.nan, 0.0, -1.0])
+    np.testing.assert_allclose(change_pct, [0.5 / 38.0 * 100.0, np.nan, np.nan, 0.0, -50.0])
+
+
+def test_numba_and_numpy_price_changes_agree():
+    if _kernels.numba is None:
+        pytest.skip("numba não está instalado")
+    
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(1.0, 100.0, 1000)
+    previous = rng.uniform(1.0, 100.0, 1000)
+    previous[::7] = 0.0
+    previous[::11] = np.nan
+    
+    for expected, result in zip(_kernels._price_changes_numpy(prices, previous),
+                                _kernels.compute_price_changes(prices, previous)):
+        np.testing.assert_allclose(result, expected, rtol=1e-12)